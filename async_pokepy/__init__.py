@@ -15,12 +15,35 @@ __license__ = "MIT"
 __copyright__ = "Copyright 2019 Lorenzo"
 __version__ = "0.1.6a"
 
+import sys
 from collections import namedtuple
 
-from .client import Client, connect  # noqa: F401
-from .exceptions import *  # noqa: F401
-from .types import *  # noqa: F401
+from . import types
+from .utils import _lazy_exports
+
+_EXPORTS = {
+    ".cache": ("CacheInfo", "LRUBackend", "TinyLFUBackend", "ObjectCache", "SpriteCache", "NegativeCache",
+               "CacheRegistry"),
+    ".client": ("Client", "connect"),
+    ".exceptions": ("PokemonException", "PokeAPIException", "RateLimited", "NotFound", "Forbidden", "NoMoreItems"),
+    ".index": ("NameIndex", "RelationIndex"),
+    ".loader": ("BatchLoader",),
+    ".scheduling": ("INTERACTIVE", "BATCH", "LaneInfo", "priority"),
+    ".sync": ("SyncClient",),
+    ".tracing": ("Tracer",),
+    ".transport": ("Response", "Transport", "AiohttpTransport", "HTTPXTransport"),
+    ".types": types.__all__,
+}
 
 VersionInfo = namedtuple("VersionInfo", "major minor micro releaselevel")
 
 version_info = VersionInfo(major=0, minor=1, micro=6, releaselevel="alpha")
+
+__all__ = tuple(name for names in _EXPORTS.values() for name in names) + ("VersionInfo", "version_info")
+
+# Submodules, and aiohttp with the client, are only imported when one of their names is used.
+__getattr__, __dir__ = _lazy_exports(__name__, globals(), _EXPORTS)
+
+if sys.version_info < (3, 7):  # Module __getattr__ isn't supported, import everything now.
+    for _name in __all__[:-2]:
+        __getattr__(_name)
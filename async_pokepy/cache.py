@@ -0,0 +1,1165 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import abc
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Coroutine, Dict, Iterator, Optional, Union
+
+from .index import NameIndex, RelationIndex
+from .utils import _make_cache_key
+
+try:
+    from lru import LRU
+except ImportError:
+    LRU = None
+
+__all__ = (
+    "CacheInfo",
+    "LRUBackend",
+    "TinyLFUBackend",
+    "ObjectCache",
+    "SpriteCache",
+    "NegativeCache",
+    "CacheRegistry",
+)
+
+CacheInfo = namedtuple("CacheInfo", "hits misses evictions coalesced currsize maxsize nbytes")
+
+# Set as the result of a load whose caller was cancelled, so the callers waiting for it retry.
+_RETRY = object()
+
+
+class LRUBackend:
+    """A pure Python least recently used mapping with a maximum size.
+
+    This is the default backend used by :class:`ObjectCache` when
+    `lru-dict <https://pypi.org/project/lru-dict/>`_ is not installed.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    maxsize: :class:`int`
+        The maximum number of items stored.
+    on_evict: Optional[Callable[[Any, Any], None]]
+        Called with the key and value of every item evicted to make room."""
+    __slots__ = ("maxsize", "_data", "_on_evict")
+
+    def __init__(self, maxsize: int, on_evict: Optional[Callable[[Any, Any], None]] = None):
+        if maxsize < 1:
+            raise ValueError("Maxsize cannot be 0 or negative.")
+
+        self.maxsize = maxsize
+        self._on_evict = on_evict
+        self._data = OrderedDict()
+
+    def __getitem__(self, key) -> Any:
+        value = self._data[key]
+        self._data.move_to_end(key)
+
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            old_key, old_value = self._data.popitem(last=False)
+
+            if self._on_evict is not None:
+                self._on_evict(old_key, old_value)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def get(self, key, default=None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=None) -> Any:
+        return self._data.pop(key, default)
+
+    def popitem(self) -> tuple:
+        """Remove and return the least recently used item."""
+        return self._data.popitem(last=False)
+
+    def items(self):
+        return self._data.items()
+
+    def clear(self):
+        self._data.clear()
+
+
+class _FrequencySketch:
+    """A count-min sketch of 4-bit counters which are halved periodically so old popularity fades."""
+    __slots__ = ("_rows", "_mask", "_additions", "_sample_size")
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity:
+            width <<= 1
+
+        self._rows = [[0] * width for _ in range(4)]
+        self._mask = width - 1
+        self._additions = 0
+        self._sample_size = 10 * width
+
+    def _indexes(self, key) -> tuple:
+        # One 64 bit mix split in four 16 bit hashes, spread over the row with a different odd multiplier each.
+        mixed = (hash(key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        mixed ^= mixed >> 29
+        mask = self._mask
+
+        return (
+            (mixed & 0xFFFF) * 0x85EBCA77 >> 4 & mask,
+            (mixed >> 16 & 0xFFFF) * 0xC2B2AE3D >> 4 & mask,
+            (mixed >> 32 & 0xFFFF) * 0x27D4EB2F >> 4 & mask,
+            (mixed >> 48) * 0x165667B1 >> 4 & mask,
+        )
+
+    def frequency(self, key) -> int:
+        first, second, third, fourth = self._indexes(key)
+        rows = self._rows
+
+        return min(rows[0][first], rows[1][second], rows[2][third], rows[3][fourth])
+
+    def increment(self, key):
+        for counters, index in zip(self._rows, self._indexes(key)):
+            if counters[index] < 15:
+                counters[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            for counters in self._rows:
+                counters[:] = [count >> 1 for count in counters]
+
+            self._additions //= 2
+
+
+class TinyLFUBackend:
+    """A frequency aware, scan resistant mapping implementing the W-TinyLFU policy.
+
+    New items enter a small LRU window, when they leave it they are only admitted into
+    the main space if they were requested more often than the items they would evict,
+    according to a compact frequency sketch. This keeps popular items around even when
+    many items are requested only once, e.g. while iterating a pagination.
+
+    With ``maxweight`` items are weighted, e.g. by their size in bytes, and both the
+    number of items and their total weight are bounded.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    maxsize: :class:`int`
+        The maximum number of items stored.
+    on_evict: Optional[Callable[[Any, Any], None]]
+        Called with the key and value of every item evicted or not admitted.
+    maxweight: Optional[:class:`int`]
+        The maximum total weight of the items stored.
+    weigher: Optional[Callable[[Any], int]]
+        A function returning the weight of a value, required with ``maxweight``."""
+    __slots__ = (
+        "maxsize", "maxweight", "weight", "_weigher", "_on_evict", "_sketch", "_window", "_probation",
+        "_protected", "_weights", "_window_weight", "_protected_weight", "_capacity", "_window_max", "_protected_max"
+    )
+
+    def __init__(self, maxsize: int, on_evict: Optional[Callable[[Any, Any], None]] = None, *,
+                 maxweight: Optional[int] = None, weigher: Optional[Callable[[Any], int]] = None):
+        if maxsize < 1:
+            raise ValueError("Maxsize cannot be 0 or negative.")
+        if maxweight is not None and weigher is None:
+            raise ValueError("A weigher is required with maxweight.")
+
+        self.maxsize = maxsize
+        self.maxweight = maxweight
+        self.weight = 0
+
+        self._weigher = weigher if maxweight is not None else None
+        self._on_evict = on_evict
+        self._sketch = _FrequencySketch(maxsize)
+
+        self._window = OrderedDict()
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+        self._weights = {}
+
+        self._capacity = maxweight if maxweight is not None else maxsize
+        self._window_max = max(self._capacity // 100, 1)
+        self._protected_max = (self._capacity - self._window_max) * 4 // 5
+        self._window_weight = 0
+        self._protected_weight = 0
+
+    def __getitem__(self, key) -> Any:
+        self._sketch.increment(key)
+
+        if key in self._window:
+            self._window.move_to_end(key)
+            return self._window[key]
+
+        if key in self._protected:
+            self._protected.move_to_end(key)
+            return self._protected[key]
+
+        value = self._probation.pop(key)
+        self._promote(key, value)
+
+        return value
+
+    def __setitem__(self, key, value):
+        self._sketch.increment(key)
+
+        if key in self:
+            self._discard(key)
+
+        weight = self._weigher(value) if self._weigher is not None else 1
+
+        self._weights[key] = weight
+        self.weight += weight
+
+        self._window[key] = value
+        self._window_weight += weight
+
+        # The window always keeps the newest item, so it gets a chance to be requested again.
+        while self._window_weight > self._window_max and len(self._window) > 1:
+            candidate, candidate_value = self._window.popitem(last=False)
+            self._window_weight -= self._weights[candidate]
+
+            self._admit(candidate, candidate_value)
+
+        while self.weight > self._capacity or len(self._weights) > self.maxsize:
+            self._evict(*self._victims(1)[0])
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+
+        self._discard(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._weights
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._weights))
+
+    def _promote(self, key, value):
+        self._protected[key] = value
+        self._protected_weight += self._weights[key]
+
+        while self._protected_weight > self._protected_max and len(self._protected) > 1:
+            demoted, demoted_value = self._protected.popitem(last=False)
+            self._protected_weight -= self._weights[demoted]
+
+            self._probation[demoted] = demoted_value
+
+    def _victims(self, needed: int) -> list:
+        victims = []
+        freed = 0
+
+        for segment in (self._probation, self._protected, self._window):
+            for victim in segment:
+                if freed >= needed:
+                    return victims
+
+                victims.append((victim, segment))
+                freed += self._weights[victim]
+
+        return victims
+
+    def _admit(self, candidate, value):
+        needed = self.weight - self._capacity
+
+        if needed > 0:
+            victims = self._victims(needed)
+            frequency = self._sketch.frequency(candidate)
+
+            if self._weights[candidate] > self._capacity or any(
+                    self._sketch.frequency(victim) >= frequency for victim, _ in victims):
+                self.weight -= self._weights.pop(candidate)
+
+                if self._on_evict is not None:
+                    self._on_evict(candidate, value)
+                return
+
+            for victim, segment in victims:
+                self._evict(victim, segment)
+
+        self._probation[candidate] = value
+
+    def _evict(self, key, segment):
+        value = segment[key]
+        self._discard(key)
+
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+    def _discard(self, key):
+        weight = self._weights.pop(key)
+        self.weight -= weight
+
+        if key in self._window:
+            del self._window[key]
+            self._window_weight -= weight
+        elif key in self._protected:
+            del self._protected[key]
+            self._protected_weight -= weight
+        else:
+            del self._probation[key]
+
+    def get(self, key, default=None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=None) -> Any:
+        try:
+            value = self._peek(key)
+        except KeyError:
+            return default
+
+        self._discard(key)
+        return value
+
+    def popitem(self) -> tuple:
+        """Remove and return the item that would be evicted first."""
+        if not self._weights:
+            raise KeyError("popitem(): mapping is empty")
+
+        key, segment = self._victims(1)[0]
+        value = segment[key]
+        self._discard(key)
+
+        return key, value
+
+    def _peek(self, key) -> Any:
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                return segment[key]
+
+        raise KeyError(key)
+
+    def items(self):
+        return [(key, self._peek(key)) for key in self]
+
+    def clear(self):
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._weights.clear()
+
+        self.weight = 0
+        self._window_weight = 0
+        self._protected_weight = 0
+
+
+if LRU is not None:
+    class _LRUDict(LRU):
+        # LRU.popitem() leaks a reference to every value it pops, del frees them.
+        __slots__ = ()
+
+        def popitem(self) -> tuple:
+            item = self.peek_last_item()
+            if item is None:
+                raise KeyError("popitem(): mapping is empty")
+
+            del self[item[0]]
+            return item
+
+
+def _lru_dict_backend(maxsize: int, on_evict: Optional[Callable[[Any, Any], None]] = None):
+    return _LRUDict(maxsize, callback=on_evict)
+
+
+def _default_backend():
+    return _lru_dict_backend if LRU else LRUBackend
+
+
+class _Entry:
+    __slots__ = ("value", "name", "expires", "size")
+
+    def __init__(self, value, name, expires, size):
+        self.value = value
+        self.name = name
+        self.expires = expires
+        self.size = size
+
+
+def _weigh(entry) -> int:
+    return max(entry.size, 1)
+
+
+class _BaseCache(metaclass=abc.ABCMeta):
+    __slots__ = ("name", "maxsize", "hits", "misses", "evictions", "coalesced", "nbytes", "_listeners",
+                 "_registry", "_value", "_lock")
+
+    def __init__(self, name: str, maxsize: Optional[int]):
+        self.name = name
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self.nbytes = 0
+
+        self._listeners = []
+        self._registry = None
+        self._value = 0  # Recent hits, decayed by the registry to share its memory budget.
+        self._lock = threading.RLock()  # Replaced by the registry's, shared by all of its caches.
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def _emit(self, event: str, amount: int = 1):
+        for listener in self._listeners:
+            listener(self.name, event, amount)
+
+    def _hit(self):
+        self.hits += 1
+        self._value += 1
+        if self._listeners:
+            self._emit("hit")
+
+    def _miss(self):
+        self.misses += 1
+        if self._listeners:
+            self._emit("miss")
+
+    @abc.abstractmethod
+    def _evict_one(self) -> int:
+        """Evict the least valuable item and return its size."""
+        raise NotImplementedError
+
+    def info(self) -> CacheInfo:
+        """Get a snapshot of the cache statistics.
+
+        Returns
+        -------
+        :class:`CacheInfo`
+            The statistics."""
+        return CacheInfo(self.hits, self.misses, self.evictions, self.coalesced, len(self), self.maxsize, self.nbytes)
+
+
+class ObjectCache(_BaseCache):
+    """A cache of full objects for a single ``get_`` method of a :class:`Client`.
+
+    Objects can be looked up both by id and by name, e.g. ``1``, ``"1"``
+    and ``"Bulbasaur"`` all refer to the same cached :class:`Pokemon`.
+
+    .. versionadded:: 0.1.7a
+
+    .. container:: operations
+
+        .. describe:: len(x)
+
+            Returns the number of cached objects.
+
+        .. describe:: y in x
+
+            Check if an id or name is cached.
+
+    Attributes
+    ----------
+    name: :class:`str`
+        The name of the method the cache belongs to, e.g. ``get_pokemon``.
+    maxsize: :class:`int`
+        The maximum number of objects stored.
+    maxbytes: Optional[:class:`int`]
+        The maximum total size of the cached objects, see :attr:`nbytes`,
+        ``None`` if only the number of objects is bounded.
+    ttl: Optional[:class:`float`]
+        How many seconds an object stays valid, ``None`` if it never expires.
+    hits: :class:`int`
+        The number of lookups that found an object.
+    misses: :class:`int`
+        The number of lookups that did not find an object.
+    evictions: :class:`int`
+        The number of objects removed to make room or because they expired.
+    coalesced: :class:`int`
+        The number of misses that waited for an already running request
+        for the same object instead of making a new one.
+    nbytes: :class:`int`
+        The size in bytes of the API responses the cached objects were built from."""
+    __slots__ = ("ttl", "maxbytes", "_data", "_names", "_pending")
+
+    def __init__(self, name: str, maxsize: int = 128, *, ttl: Optional[float] = None,
+                 backend: Callable = None, maxbytes: Optional[int] = None):
+        super().__init__(name, maxsize)
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+
+        self._names = {}
+        self._pending = {}
+
+        if maxbytes is None:
+            self._data = (backend or _default_backend())(maxsize, self._on_evict)
+        else:
+            self._data = (backend or TinyLFUBackend)(maxsize, self._on_evict, maxweight=maxbytes, weigher=_weigh)
+
+    def __repr__(self) -> str:
+        return "<ObjectCache name='{0.name}' size={1} maxsize={0.maxsize}>".format(self, len(self))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def _forget(self, key, entry):
+        self.nbytes -= entry.size
+
+        if entry.name is not None and self._names.get(entry.name) == key:
+            del self._names[entry.name]
+
+    def _on_evict(self, key, entry):
+        self._forget(key, entry)
+
+        self.evictions += 1
+        if self._listeners:
+            self._emit("eviction")
+
+    def _resolve(self, key):
+        key = _make_cache_key(key)
+
+        if isinstance(key, str):
+            return self._names.get(key)
+
+        return key
+
+    def _lookup(self, key):
+        key = self._resolve(key)
+        entry = self._data.get(key) if key is not None else None
+
+        if entry is None:
+            return None
+
+        if entry.expires is not None and entry.expires <= time.monotonic():
+            del self._data[key]
+            self._on_evict(key, entry)
+
+            return None
+
+        return entry.value
+
+    def get(self, key: Union[int, str]) -> Optional[Any]:
+        """Get an object by id or name.
+
+        Parameters
+        ----------
+        key: Union[:class:`int`, :class:`str`]
+            The id or name of the object.
+
+        Returns
+        -------
+        Optional[:data:`~typing.Any`]
+            The cached object or ``None`` if it's not cached or expired."""
+        with self._lock:
+            value = self._lookup(key)
+
+            if value is None:
+                self._miss()
+            else:
+                self._hit()
+
+            return value
+
+    async def load(self, key: Union[int, str], loader: Callable[[], Coroutine]) -> Any:
+        """Get an object, or load it if it's not cached.
+
+        Concurrent loads for the same key wait for the first one
+        instead of calling ``loader`` again, even from other threads and event loops.
+        If the first one is cancelled, one of them calls its ``loader`` instead.
+
+        Parameters
+        ----------
+        key: Union[:class:`int`, :class:`str`]
+            The id or name of the object.
+        loader: Callable[[], Coroutine]
+            A coroutine function that fetches the object and stores it with :meth:`put`.
+
+        Returns
+        -------
+        :data:`~typing.Any`
+            The object."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        key = _make_cache_key(key)
+
+        while True:
+            with self._lock:
+                future = self._pending.get(key)
+
+                if future is None:
+                    # A load on another thread may have stored it since it was looked up.
+                    value = self._lookup(key)
+                    if value is not None:
+                        return value
+
+                    # A concurrent future so loads running on other event loops can wait for it too.
+                    future = self._pending[key] = concurrent.futures.Future()
+                    waiting = False
+                else:
+                    self.coalesced += 1
+                    if self._listeners:
+                        self._emit("coalesced")
+                    waiting = True
+
+            if not waiting:
+                break
+
+            value = await asyncio.shield(asyncio.wrap_future(future))
+            if value is not _RETRY:
+                return value
+
+        try:
+            value = await loader()
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[key]
+
+            if isinstance(exc, Exception) and not isinstance(exc, asyncio.CancelledError):
+                future.set_exception(exc)
+            else:
+                # Only the first caller was cancelled, the others load the object themselves.
+                future.set_result(_RETRY)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+
+        future.set_result(value)
+        return value
+
+    def put(self, key: int, value: Any, *, name: Optional[str] = None, size: int = 0):
+        """Store an object.
+
+        Parameters
+        ----------
+        key: :class:`int`
+            The id of the object.
+        value: :data:`~typing.Any`
+            The object.
+        name: Optional[:class:`str`]
+            The name of the object, if it's searchable by name.
+        size: :class:`int`
+            The size of the object in bytes, usually the size of the API response it was built from."""
+        key = _make_cache_key(key)
+        if name is not None:
+            name = _make_cache_key(name)
+
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._forget(key, old)
+
+            if name is not None:
+                self._names[name] = key
+
+            self.nbytes += size
+            self._data[key] = _Entry(value, name, expires, size)
+
+            if self._registry is not None:
+                self._registry._reclaim()  # pylint: disable=protected-access
+
+    def invalidate(self, key: Union[int, str]):
+        """Remove an object from the cache, by id or name.
+
+        Parameters
+        ----------
+        key: Union[:class:`int`, :class:`str`]
+            The id or name of the object."""
+        with self._lock:
+            key = self._resolve(key)
+
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._forget(key, entry)
+
+    def _evict_one(self) -> int:
+        with self._lock:
+            key, entry = self._data.popitem()
+            self._on_evict(key, entry)
+
+        return entry.size
+
+    def clear(self):
+        """Remove all objects from the cache."""
+        with self._lock:
+            self._data.clear()
+            self._names.clear()
+            self.nbytes = 0
+
+
+class SpriteCache(_BaseCache):
+    """A cache of sprites downloaded with :meth:`Client.read_sprite`, keyed by url.
+
+    Has the same statistics attributes as :class:`ObjectCache`.
+
+    Sprites are only evicted, least recently used first, when the
+    :class:`CacheRegistry` it belongs to is over its ``budget``.
+
+    .. versionadded:: 0.1.7a
+
+    .. container:: operations
+
+        .. describe:: len(x)
+
+            Returns the number of cached sprites."""
+    __slots__ = ("_data",)
+
+    def __init__(self):
+        super().__init__("sprites", None)
+
+        self._data = OrderedDict()
+
+    def __repr__(self) -> str:
+        return "<SpriteCache size={0} nbytes={1.nbytes}>".format(len(self), self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Get a sprite.
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The url of the sprite.
+
+        Returns
+        -------
+        Optional[:class:`bytes`]
+            The sprite or ``None`` if it's not cached."""
+        with self._lock:
+            data = self._data.get(url)
+
+            if data is None:
+                self._miss()
+            else:
+                self._data.move_to_end(url)
+                self._hit()
+
+            return data
+
+    def put(self, url: str, data: bytes):
+        """Store a sprite.
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The url of the sprite.
+        data: :class:`bytes`
+            The sprite."""
+        with self._lock:
+            old = self._data.pop(url, None)
+            if old is not None:
+                self.nbytes -= len(old)
+
+            self._data[url] = data
+            self.nbytes += len(data)
+
+            if self._registry is not None:
+                self._registry._reclaim()  # pylint: disable=protected-access
+
+    def _evict_one(self) -> int:
+        with self._lock:
+            _, data = self._data.popitem(last=False)
+            self.nbytes -= len(data)
+
+            self.evictions += 1
+            if self._listeners:
+                self._emit("eviction")
+
+        return len(data)
+
+    def clear(self):
+        """Remove all sprites from the cache."""
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
+class NegativeCache(_BaseCache):
+    """A short lived cache of the :exc:`NotFound` errors raised by the ``get_`` methods of a :class:`Client`.
+
+    Errors are keyed by the method name and the normalized query, e.g. ``("get_pokemon", "mr-mime")``,
+    so repeated lookups of a misspelled name don't make a request every time.
+    They are forgotten once their ``ttl`` is over or when an object is found for the same query.
+
+    Has the same statistics attributes as :class:`ObjectCache`, a miss being a lookup
+    that had to make a request.
+
+    .. versionadded:: 0.1.7a
+
+    .. container:: operations
+
+        .. describe:: len(x)
+
+            Returns the number of cached errors.
+
+    Parameters
+    ----------
+    maxsize: :class:`int`
+        The maximum number of errors stored, ``0`` disables the cache.
+    ttl: :class:`float`
+        How many seconds an error is cached, ``0`` disables the cache."""
+    __slots__ = ("ttl", "_data")
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        super().__init__("not_found", maxsize)
+        self.ttl = ttl
+
+        self._data = OrderedDict()
+
+    def __repr__(self) -> str:
+        return "<NegativeCache size={0} maxsize={1.maxsize} ttl={1.ttl}>".format(len(self), self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: tuple) -> Optional[Exception]:
+        """Get the error of a lookup.
+
+        Parameters
+        ----------
+        key: Tuple[:class:`str`, Union[:class:`int`, :class:`str`]]
+            The method name and the normalized query.
+
+        Returns
+        -------
+        Optional[:exc:`Exception`]
+            The error or ``None`` if it's not cached or expired."""
+        with self._lock:
+            try:
+                error, expires = self._data[key]
+            except KeyError:
+                self._miss()
+                return None
+
+            if expires <= time.monotonic():
+                del self._data[key]
+                self._miss()
+
+                return None
+
+            self._hit()
+            return error
+
+    def put(self, key: tuple, error: Exception):
+        """Store the error of a lookup.
+
+        Parameters
+        ----------
+        key: Tuple[:class:`str`, Union[:class:`int`, :class:`str`]]
+            The method name and the normalized query.
+        error: :exc:`Exception`
+            The error."""
+        if not self.maxsize or not self.ttl:
+            return
+
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (error, time.monotonic() + self.ttl)
+
+            while len(self._data) > self.maxsize:
+                self._evict_one()
+
+    def _evict_one(self) -> int:
+        with self._lock:
+            self._data.popitem(last=False)
+
+            self.evictions += 1
+            if self._listeners:
+                self._emit("eviction")
+
+        # Errors aren't counted in the memory budget.
+        return 0
+
+    def invalidate(self, key: tuple):
+        """Forget the error of a lookup.
+
+        Parameters
+        ----------
+        key: Tuple[:class:`str`, Union[:class:`int`, :class:`str`]]
+            The method name and the normalized query."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all errors from the cache."""
+        with self._lock:
+            self._data.clear()
+
+
+class CacheRegistry:
+    """The set of :class:`ObjectCache` used by a :class:`Client`.
+
+    Every client creates its own registry from the ``cache_`` options of :func:`connect`,
+    to share the same caches between clients create one and pass it as ``cache``.
+
+    Registries are thread-safe, so clients running on different threads and event loops
+    can share one, and concurrent requests for the same object are made only once.
+
+    .. warning::
+
+        Only share a registry between clients connected to the same ``base``.
+
+    .. versionadded:: 0.1.7a
+
+    .. container:: operations
+
+        .. describe:: x[y]
+
+            Returns the :class:`ObjectCache` of the y method, e.g. ``get_pokemon``.
+
+        .. describe:: iter(x)
+
+            Returns an iterator over the object caches created so far.
+
+    Parameters
+    ----------
+    maxsize: Union[:class:`int`, Dict[:class:`str`, :class:`int`]]
+        The maximum number of objects for each cache, or a mapping
+        of method names to the maximum number of objects of that cache.
+        Missing methods default to ``128``.
+    ttl: Optional[:class:`float`]
+        How many seconds cached objects stay valid, defaults to ``None`` which means forever.
+    backend: Optional[Callable[[:class:`int`, Callable], MutableMapping]]
+        A callable, taking the maxsize and an eviction callback, that returns the mapping
+        used to store objects. Defaults to `lru-dict <https://pypi.org/project/lru-dict/>`_ if
+        installed or :class:`LRUBackend`, or :class:`TinyLFUBackend` with ``maxbytes``.
+    maxbytes: Optional[Union[:class:`int`, Dict[:class:`str`, :class:`int`]]]
+        The maximum total size in bytes, measured on the API responses, for each cache
+        or a mapping of method names to the size of that cache. Missing methods and ``None``,
+        the default, only bound the number of objects.
+        Backends used with it must also accept the ``maxweight`` and ``weigher`` keyword arguments
+        of :class:`TinyLFUBackend`.
+    budget: Optional[:class:`int`]
+        The maximum size in bytes of all caches together, including the sprite cache.
+        When it's exceeded objects are evicted from the caches using the most memory
+        compared to how often they are hit recently, so caches that are hit more get a
+        bigger part of the budget. Defaults to ``None`` which means no global limit.
+        Backends used with it must implement ``popitem()``, removing the item to evict first.
+    negative_maxsize: :class:`int`
+        The maximum number of :exc:`NotFound` errors cached, defaults to ``256``.
+    negative_ttl: :class:`float`
+        How many seconds :exc:`NotFound` errors are cached, defaults to ``60``.
+    relations: :class:`bool`
+        Whether to index the relationships of the objects stored, defaults to ``False``.
+
+    Attributes
+    ----------
+    sprites: :class:`SpriteCache`
+        The sprite cache.
+    not_found: :class:`NegativeCache`
+        The cache of :exc:`NotFound` errors.
+    names: :class:`NameIndex`
+        The index of names used to turn queries into ids before looking them up.
+    relations: Optional[:class:`RelationIndex`]
+        The index of relationships, ``None`` unless enabled with ``relations``."""
+    __slots__ = (
+        "maxsize", "ttl", "backend", "maxbytes", "budget", "sprites", "not_found", "names", "relations",
+        "_caches", "_listeners", "_puts", "_lock"
+    )
+
+    DEFAULT_MAXSIZE = 128
+
+    # How many stores between halving the recent hits of each cache.
+    DECAY_INTERVAL = 1000
+
+    def __init__(self, maxsize: Union[int, dict] = DEFAULT_MAXSIZE, *, ttl: Optional[float] = None,
+                 backend: Callable = None, maxbytes: Union[int, dict, None] = None, budget: Optional[int] = None,
+                 negative_maxsize: int = 256, negative_ttl: float = 60.0, relations: bool = False):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self.maxbytes = maxbytes
+        self.budget = budget
+
+        self._caches = {}
+        self._listeners = []
+        self._puts = 0
+        self._lock = threading.RLock()
+
+        self.sprites = SpriteCache()
+        self._adopt(self.sprites)
+
+        self.not_found = NegativeCache(negative_maxsize, negative_ttl)
+        self._adopt(self.not_found)
+
+        self.names = NameIndex()
+        self.relations = RelationIndex(self.names) if relations else None
+
+    def __repr__(self) -> str:
+        return "<CacheRegistry caches={0}>".format(list(self._caches))
+
+    def __getitem__(self, name: str) -> ObjectCache:
+        try:
+            return self._caches[name]
+        except KeyError:
+            pass
+
+        with self._lock:
+            cache = self._caches.get(name)
+
+            if cache is None:
+                cache = ObjectCache(
+                    name, self._maxsize_for(name), ttl=self.ttl, backend=self.backend,
+                    maxbytes=self._maxbytes_for(name)
+                )
+                self._adopt(cache)
+                self._caches[name] = cache
+
+            return cache
+
+    def __iter__(self) -> Iterator[ObjectCache]:
+        return iter(list(self._caches.values()))
+
+    def _maxsize_for(self, name: str) -> int:
+        if isinstance(self.maxsize, dict):
+            return self.maxsize.get(name, self.DEFAULT_MAXSIZE)
+
+        return self.maxsize
+
+    def _maxbytes_for(self, name: str) -> Optional[int]:
+        if isinstance(self.maxbytes, dict):
+            return self.maxbytes.get(name)
+
+        return self.maxbytes
+
+    # pylint: disable=protected-access
+
+    def _adopt(self, cache: _BaseCache):
+        cache._listeners = self._listeners
+        cache._lock = self._lock
+
+        if self.budget is not None:
+            cache._registry = self
+
+    def _reclaim(self):
+        caches = list(self._caches.values())
+        caches.append(self.sprites)
+
+        self._puts += 1
+        if self._puts >= self.DECAY_INTERVAL:
+            self._puts = 0
+            for cache in caches:
+                cache._value //= 2
+
+        total = sum(cache.nbytes for cache in caches)
+        if total <= self.budget:
+            return
+
+        value = sum(cache._value + 1 for cache in caches)
+
+        def excess(cache):
+            return cache.nbytes - self.budget * (cache._value + 1) / value
+
+        while total > self.budget:
+            victim = max((cache for cache in caches if len(cache)), key=excess, default=None)
+            if victim is None:
+                # The sizes counted drifted from the entries left, there is nothing more to evict.
+                return
+
+            total -= victim._evict_one()
+
+    # pylint: enable=protected-access
+
+    @property
+    def nbytes(self) -> int:
+        """:class:`int`: The size in bytes of all caches together, see :attr:`ObjectCache.nbytes`."""
+        return sum(cache.nbytes for cache in self) + self.sprites.nbytes
+
+    def add_listener(self, listener: Callable[[str, str, int], None]):
+        """Add a function called on every cache event, useful to export statistics to a metrics system.
+
+        The function is called with the name of the cache, e.g. ``get_pokemon`` or ``sprites``,
+        the name of the event, one of ``hit``, ``miss``, ``eviction`` and ``coalesced``,
+        and by how much the counter increased.
+
+        Parameters
+        ----------
+        listener: Callable[[:class:`str`, :class:`str`, :class:`int`], None]
+            The function, it must not be a coroutine."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, str, int], None]):
+        """Remove a function added with :meth:`add_listener`.
+
+        Parameters
+        ----------
+        listener: Callable[[:class:`str`, :class:`str`, :class:`int`], None]
+            The function."""
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def info(self) -> Dict[str, CacheInfo]:
+        """Get a snapshot of the statistics of every cache, including ``sprites`` and ``not_found``.
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`CacheInfo`]
+            A mapping of cache names to their statistics."""
+        ret = {cache.name: cache.info() for cache in self}
+        ret[self.sprites.name] = self.sprites.info()
+        ret[self.not_found.name] = self.not_found.info()
+
+        return ret
+
+    def clear(self):
+        """Clear all caches."""
+        for cache in self:
+            cache.clear()
+
+        self.sprites.clear()
+        self.not_found.clear()
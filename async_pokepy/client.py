@@ -24,15 +24,57 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+import asyncio
 import io
-from typing import Union
+import time
+from typing import Any, Dict, Iterable, List, Union
 
+from .cache import CacheInfo, CacheRegistry
+from .exceptions import PokemonException
 from .http import HTTPPokemonClient
-from .types import Ability, AsyncPaginationIterator, Berry, Machine, Move, Pokemon, PokemonColor, PokemonHabitat
-from .utils import cached
+from .index import RelationIndex
+from .loader import BatchLoader
+from .scheduling import LaneInfo
+from .types import (Ability, APIObject, AsyncPaginationIterator, Berry, Machine, Move, NamedAPIObject, Pokemon,
+                    PokemonColor, PokemonHabitat)
+from .types.abc import _rebuild
+from .utils import _make_cache_key, cached
 
 __all__ = ("connect",)
 
+# The references each model can expand with include, by name, with the model they refer to.
+_INCLUDES = {
+    Pokemon: {
+        "abilities": (lambda pokemon: [ability.ability for ability in pokemon.abilities], Ability),
+        "moves": (lambda pokemon: [move.move for move in pokemon.moves], Move),
+    },
+    Move: {
+        "machines": (lambda move: [detail.machine for detail in move.machines], Machine),
+    },
+    Ability: {
+        "pokemon": (lambda ability: [pokemon.pokemon for pokemon in ability.pokemon], Pokemon),
+    },
+    Machine: {
+        "move": (lambda machine: [machine.move], Move),
+    },
+}
+
+# The model returned by each get_ method.
+_MODELS = {
+    "get_pokemon": Pokemon,
+    "get_move": Move,
+    "get_ability": Ability,
+    "get_berry": Berry,
+    "get_pokemon_color": PokemonColor,
+    "get_pokemon_habitat": PokemonHabitat,
+    "get_machine": Machine,
+}
+
+
+def _detach(obj):
+    # A copy of a cached object, built lazily from the same data, to resolve references on.
+    return _rebuild(type(obj), obj.to_dict())
+
 
 def connect(base="https://pokeapi.co/api/v2/", **kwargs):
     """Connect to the PokeAPI.
@@ -65,6 +107,36 @@ def connect(base="https://pokeapi.co/api/v2/", **kwargs):
         The base to use for all API requests, useful to edit if you
         want to host your own instance of the API.
         Defaults to ``https://pokeapi.co/api/v2/``.
+    bases: Optional[List[:class:`str`]]
+        Several bases of mirrors of the API, replacing ``base``. Every request goes to one of two mirrors
+        picked at random, whichever responded faster recently with fewer requests in flight.
+        A request failing or rate limited on a mirror is retried on another, and a mirror failing
+        three times in a row is left out until it responds again.
+
+        .. versionadded:: 0.1.7a
+    health_check_interval: Optional[:class:`float`]
+        How often, in seconds, the mirrors left out are checked to see if they're back,
+        ``0`` disables the checks so they're only retried by requests. Defaults to ``10``.
+
+        .. versionadded:: 0.1.7a
+    max_concurrency: Optional[:class:`int`]
+        How many requests can be in flight at once, defaults to ``1``.
+        With ``adaptive_concurrency`` this is the highest the limit can grow to, and defaults to ``64``.
+
+        .. versionadded:: 0.1.7a
+    adaptive_concurrency: Optional[:class:`bool`]
+        Whether to adapt how many requests can be in flight at once to what the API can take.
+        The limit starts at ``4`` and grows by one every as many requests while their latency stays
+        within twice the lowest recently seen. It's cut by 10% when latency rises above that,
+        and halved on 429s, 5xx errors and connection errors. Defaults to ``False``,
+        see :attr:`Client.concurrency_limit` and :meth:`Tracer.on_concurrency_limit`.
+
+        .. versionadded:: 0.1.7a
+    batch_share: Optional[:class:`float`]
+        The share of the requests served from the :data:`BATCH` lane while requests wait in both lanes,
+        see :func:`priority`. :data:`INTERACTIVE` requests are served first otherwise. Defaults to ``0.1``.
+
+        .. versionadded:: 0.1.7a
     user_agent: Optional[:class:`str`]
         The User-Agent header to use when making requests.
     loop: Optional[:class:`asyncio.AbstractEventLoop`]
@@ -72,6 +144,108 @@ def connect(base="https://pokeapi.co/api/v2/", **kwargs):
         :func:`asyncio.get_event_loop` is used to get one.
     session: Optional[:class:`aiohttp.ClientSession`]
         The client session to use during requests.
+    transport: Optional[:class:`Transport`]
+        The HTTP layer used to make requests, defaults to an :class:`AiohttpTransport`
+        created from ``user_agent``, ``session`` and ``trace_configs``, which are ignored when this is passed.
+
+        .. versionadded:: 0.1.7a
+    cache_size: Optional[Union[:class:`int`, Dict[:class:`str`, :class:`int`]]]
+        The maximum number of objects cached by each ``get_`` method,
+        or a mapping of method names to their maximum, e.g. ``{"get_pokemon": 512}``.
+        Defaults to ``128``.
+
+        .. versionadded:: 0.1.7a
+    cache_ttl: Optional[:class:`float`]
+        How many seconds cached objects stay valid, defaults to ``None`` which means forever.
+
+        .. versionadded:: 0.1.7a
+    cache_backend: Optional[Callable[[:class:`int`, Callable], MutableMapping]]
+        The backend used to store cached objects, see :class:`CacheRegistry`.
+
+        .. versionadded:: 0.1.7a
+    cache_maxbytes: Optional[Union[:class:`int`, Dict[:class:`str`, :class:`int`]]]
+        The maximum size in bytes of the API responses behind the objects cached by each ``get_``
+        method, or a mapping of method names to their maximum. When set, caches use
+        :class:`TinyLFUBackend` unless ``cache_backend`` is passed. Defaults to ``None``.
+
+        .. versionadded:: 0.1.7a
+    cache_budget: Optional[:class:`int`]
+        The maximum size in bytes of all caches together, sprites included, shared
+        between them by how often they are hit. Defaults to ``None`` which means no limit,
+        see :class:`CacheRegistry`.
+
+        .. versionadded:: 0.1.7a
+    cache_negative_size: Optional[:class:`int`]
+        The maximum number of :exc:`NotFound` errors cached, so the same unknown
+        query doesn't make a request every time. Defaults to ``256``, ``0`` disables it.
+
+        .. versionadded:: 0.1.7a
+    cache_negative_ttl: Optional[:class:`float`]
+        How many seconds :exc:`NotFound` errors are cached. Defaults to ``60``, ``0`` disables it.
+
+        .. versionadded:: 0.1.7a
+    index_relations: Optional[:class:`bool`]
+        Whether to index the relationships of the objects fetched, needed by
+        :meth:`Client.get_learners` and the other relationship queries. Defaults to ``False``.
+
+        .. versionadded:: 0.1.7a
+    executor: Optional[:class:`concurrent.futures.Executor`]
+        An executor used to decode large responses and build the objects from them,
+        instead of the event loop. Both hold the GIL, so with a :class:`~concurrent.futures.ThreadPoolExecutor`
+        the event loop is blocked for about :func:`sys.getswitchinterval` at a time instead of
+        the whole duration. A :class:`~concurrent.futures.ProcessPoolExecutor` only decodes responses,
+        objects are built on the event loop since they would be pickled back unbuilt,
+        and the decoded data is still unpickled there. Defaults to ``None`` which means inline.
+
+        .. versionadded:: 0.1.7a
+    offload_threshold: Optional[:class:`int`]
+        The size in bytes from which responses are handled by the ``executor``.
+        Defaults to ``None`` which means responses are offloaded once handling
+        them inline was measured to block the event loop for more than a millisecond.
+
+        .. versionadded:: 0.1.7a
+    hedge: Optional[:class:`bool`]
+        Whether to send a second, identical, request when one takes longer than the recent latencies
+        of its endpoint usually do, using whichever response comes first and cancelling the other.
+        This cuts the tail latency caused by occasionally slow responses. Hedges are only sent when
+        a concurrency slot is free, see ``max_concurrency``. Defaults to ``False``.
+
+        .. versionadded:: 0.1.7a
+    hedge_percentile: Optional[:class:`float`]
+        The percentile of the recent latencies after which a request is hedged, defaults to ``95``.
+
+        .. versionadded:: 0.1.7a
+    hedge_budget: Optional[:class:`float`]
+        The maximum number of hedged requests per request made, so they can't
+        multiply the load on the API when it's slow overall. Defaults to ``0.05``.
+
+        .. versionadded:: 0.1.7a
+    cache: Optional[:class:`CacheRegistry`]
+        A registry to use instead of creating a new one, useful to share
+        the same caches between clients. If passed the other ``cache_``
+        options are ignored.
+
+        .. versionadded:: 0.1.7a
+    tracers: Optional[List[:class:`Tracer`]]
+        Hooks called during the lifecycle of every request.
+
+        .. versionadded:: 0.1.7a
+    trace_configs: Optional[List[:class:`aiohttp.TraceConfig`]]
+        Passed to the :class:`aiohttp.ClientSession` created by the client.
+
+        .. versionadded:: 0.1.7a
+    log_payload_limit: Optional[:class:`int`]
+        How many bytes of a successful response body are logged at the ``DEBUG`` level,
+        ``0`` disables payload logging. Defaults to ``200``.
+
+        .. versionadded:: 0.1.7a
+    log_summaries: Optional[:class:`bool`]
+        Whether to log a summary of every response at the ``INFO`` level, with the method, url,
+        endpoint, status, elapsed time, body size and attempt number as a :class:`dict`
+        in the ``pokeapi_request`` attribute of the :class:`logging.LogRecord`.
+        Defaults to ``False``.
+
+        .. versionadded:: 0.1.7a
 
     Returns
     -------
@@ -110,29 +284,209 @@ class Client:
     ----------
     loop: :class:`asyncio.AbstractEventLoop`
         The event loop used for HTTP requests."""
-    __slots__ = ("_http", "loop", "_image_cache")
+    __slots__ = ("_http", "loop", "_caches", "_loader")
 
-    def __init__(self, http_client: HTTPPokemonClient):
+    def __init__(self, http_client: HTTPPokemonClient, caches: CacheRegistry):
         self._http = http_client
         self.loop = http_client.loop
 
-        self._image_cache = {}
+        self._caches = caches
+        self._loader = BatchLoader(self)
 
     @classmethod
     async def _connect(cls, base, **kwargs):
+        caches = kwargs.pop("cache", None)
+        cache_options = {
+            "maxsize": kwargs.pop("cache_size", CacheRegistry.DEFAULT_MAXSIZE),
+            "ttl": kwargs.pop("cache_ttl", None),
+            "backend": kwargs.pop("cache_backend", None),
+            "maxbytes": kwargs.pop("cache_maxbytes", None),
+            "budget": kwargs.pop("cache_budget", None),
+            "negative_maxsize": kwargs.pop("cache_negative_size", 256),
+            "negative_ttl": kwargs.pop("cache_negative_ttl", 60.0),
+            "relations": kwargs.pop("index_relations", False),
+        }
+
+        if caches is None:
+            caches = CacheRegistry(**cache_options)
+
         http = HTTPPokemonClient(base, **kwargs)
-        await http.connect()
 
-        return cls(http)
+        for tracer in http.tracers:
+            caches.add_listener(tracer.on_cache_event)
+
+        return cls(http, caches)
+
+    MAX_INCLUDE_DEPTH = 3
+
+    def _include_tree(self, method: str, include: Iterable[str]) -> dict:
+        # Checked before the object is fetched, so a typo doesn't cost a request.
+        if isinstance(include, str):
+            raise TypeError("include must be an iterable of names, not a string.")
+
+        tree = {}
+
+        for path in include:
+            names = path.split(".")
+            if len(names) > self.MAX_INCLUDE_DEPTH:
+                raise ValueError("Cannot include {0}, the maximum depth is {1}.".format(path, self.MAX_INCLUDE_DEPTH))
+
+            node = tree
+            model = _MODELS[method]
+            for name in names:
+                try:
+                    _, model = _INCLUDES[model][name]
+                except KeyError:
+                    raise ValueError("{0} has no {1} to include.".format(model.__name__, name)) from None
+
+                node = node.setdefault(name, {})
+
+        return tree
+
+    async def _include(self, obj, tree: dict):
+        # References are resolved on a copy, on the cached object they would keep the objects they
+        # point to alive outside of the cache size and memory budget.
+        obj = _detach(obj)
+        await self._expand([obj], tree)
+
+        return obj
+
+    async def _expand(self, objects: list, tree: dict):
+        # Every reference of a level is resolved in the same batch, then each branch goes one level deeper.
+        refs = {name: [ref for obj in objects for ref in _INCLUDES[type(obj)][name][0](obj)] for name in tree}
+
+        values = iter(await self.resolve_all([ref for name in tree for ref in refs[name]]))
+        for name, children in tree.items():
+            for ref in refs[name]:
+                value = next(values)
+                ref.resolved = _detach(value) if children else value
+
+        await asyncio.gather(*[
+            self._expand([ref.resolved for ref in refs[name]], children)
+            for name, children in tree.items() if children
+        ])
+
+    async def _build(self, model, data):
+        builder = self._http.builder
+        nbytes = getattr(data, "nbytes", 0)
+
+        if not self._http.tracers:
+            return await builder.run(self.loop, nbytes, model, data)
+
+        start = time.perf_counter()
+        ret = await builder.run(self.loop, nbytes, model, data)
+        self._http.trace("on_model_build", model, time.perf_counter() - start)
+
+        return ret
+
+    @property
+    def caches(self) -> CacheRegistry:
+        """:class:`CacheRegistry`: The caches used by this client.
+
+        .. versionadded:: 0.1.7a"""
+        return self._caches
+
+    @property
+    def loader(self) -> BatchLoader:
+        """:class:`BatchLoader`: The loader used by :meth:`resolve`.
+
+        .. versionadded:: 0.1.7a"""
+        return self._loader
+
+    async def resolve(self, ref: APIObject) -> Any:
+        """Get the full object of a reference, e.g. the :class:`Ability` of :attr:`PokemonAbility.ability`.
+
+        References resolved concurrently, e.g. with :meth:`resolve_all` or :func:`asyncio.gather`,
+        are collected by the :attr:`loader` and fetched in a single batch, the same object
+        being fetched only once and cached objects being returned without a request.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        ref: :class:`APIObject`
+            The reference, usually a :class:`NamedAPIObject`.
+
+        Raises
+        ------
+        PokemonException
+            There is no ``get_`` method for the reference's endpoint.
+        PokeAPIException
+            The request failed.
+
+        Returns
+        -------
+        :data:`~typing.Any`
+            The full object."""
+        return await asyncio.shield(self._loader.load(ref.endpoint, ref.id))
+
+    async def resolve_all(self, refs: Iterable[APIObject]) -> List[Any]:
+        """Resolve many references at once, see :meth:`resolve`.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        refs: Iterable[:class:`APIObject`]
+            The references.
+
+        Raises
+        ------
+        PokemonException
+            There is no ``get_`` method for the endpoint of a reference.
+        PokeAPIException
+            A request failed.
+
+        Returns
+        -------
+        List[:data:`~typing.Any`]
+            The full objects, in the same order."""
+        futures = [asyncio.shield(self._loader.load(ref.endpoint, ref.id)) for ref in refs]
+
+        return await asyncio.gather(*futures)
+
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """Get a snapshot of the statistics of every cache used by this client.
+
+        .. versionadded:: 0.1.7a
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`CacheInfo`]
+            A mapping of cache names, e.g. ``get_pokemon`` or ``sprites``, to their statistics."""
+        return self._caches.info()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """:class:`int`: How many requests can currently be in flight at once,
+        see the ``adaptive_concurrency`` parameter of :func:`connect`.
+
+        .. versionadded:: 0.1.7a"""
+        return self._http.scheduler.concurrency
+
+    def lane_info(self) -> Dict[str, LaneInfo]:
+        """Get a snapshot of the request queues of the priority lanes, see :func:`priority`.
+
+        .. versionadded:: 0.1.7a
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`LaneInfo`]
+            A mapping of lanes, :data:`INTERACTIVE` and :data:`BATCH`, to the
+            number of requests waiting in them and the number of requests they were served."""
+        return self._http.scheduler.info()
 
     async def close(self):
         """Close the connection to the API.
 
         Use this when cleaning up."""
+        for tracer in self._http.tracers:
+            self._caches.remove_listener(tracer.on_cache_event)
+
         await self._http.close()
 
-    @cached(128)
-    async def get_pokemon(self, query: Union[int, str]) -> Pokemon:
+    @cached()
+    async def get_pokemon(self, query: Union[int, str], priority: str = None) -> Pokemon:
         """Get a :class:`Pokemon` from the API.
         The query can be both the name or the ID as a string or integer.
 
@@ -142,6 +496,19 @@ class Client:
         ----------
         query: Union[:class:`int`, :class:`str`]
             The name or id of the Pokèmon.
+        include: Iterable[:class:`str`]
+            The references to fetch too, concurrently and in a single batch, among ``abilities`` and ``moves``.
+            Deeper references can be included with dotted paths, e.g. ``abilities.pokemon``, up to 3 levels.
+            The full objects are set as the :attr:`~APIObject.resolved` attribute of each reference,
+            on a copy of the object so the cached one is left untouched.
+
+            .. versionadded:: 0.1.7a
+
+        priority: Optional[:class:`str`]
+            The lane of the request, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority`.
+
+            .. versionadded:: 0.1.7a
 
         Raises
         ------
@@ -156,14 +523,14 @@ class Client:
         -------
         :class:`Pokemon`
             The Pokèmon searched for."""
-        data = await self._http.get_pokemon(query)
+        data = await self._http.get_pokemon(query, priority)
 
-        ret = Pokemon(data)
+        ret = await self._build(Pokemon, data)
 
         return ret
 
-    @cached(128)
-    async def get_move(self, query: Union[int, str]) -> Move:
+    @cached()
+    async def get_move(self, query: Union[int, str], priority: str = None) -> Move:
         """Get a :class:`Move` from the API.
         The query can be both the name or the ID as a string or integer.
 
@@ -175,6 +542,19 @@ class Client:
         ----------
         query: Union[:class:`int`, :class:`str`]
             The name or id of the move.
+        include: Iterable[:class:`str`]
+            The references to fetch too, concurrently and in a single batch, among ``machines``.
+            Deeper references can be included with dotted paths, e.g. ``machines.move``, up to 3 levels.
+            The full objects are set as the :attr:`~APIObject.resolved` attribute of each reference,
+            on a copy of the object so the cached one is left untouched.
+
+            .. versionadded:: 0.1.7a
+
+        priority: Optional[:class:`str`]
+            The lane of the request, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority`.
+
+            .. versionadded:: 0.1.7a
 
         Raises
         ------
@@ -189,14 +569,14 @@ class Client:
         -------
         :class:`Move`
             The move searched for."""
-        data = await self._http.get_move(query)
+        data = await self._http.get_move(query, priority)
 
-        ret = Move(data)
+        ret = await self._build(Move, data)
 
         return ret
 
-    @cached(128)
-    async def get_ability(self, query: Union[int, str]) -> Ability:
+    @cached()
+    async def get_ability(self, query: Union[int, str], priority: str = None) -> Ability:
         """Get a :class:`Ability` from the API.
         The query can be both the name or the ID as a string or integer.
 
@@ -208,6 +588,19 @@ class Client:
         ----------
         query: Union[:class:`int`, :class:`str`]
             The name or id of the ability.
+        include: Iterable[:class:`str`]
+            The references to fetch too, concurrently and in a single batch, among ``pokemon``.
+            Deeper references can be included with dotted paths, e.g. ``pokemon.moves``, up to 3 levels.
+            The full objects are set as the :attr:`~APIObject.resolved` attribute of each reference,
+            on a copy of the object so the cached one is left untouched.
+
+            .. versionadded:: 0.1.7a
+
+        priority: Optional[:class:`str`]
+            The lane of the request, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority`.
+
+            .. versionadded:: 0.1.7a
 
         Raises
         ------
@@ -222,14 +615,14 @@ class Client:
         -------
         :class:`Ability`
             The move searched for."""
-        data = await self._http.get_ability(query)
+        data = await self._http.get_ability(query, priority)
 
-        ret = Ability(data)
+        ret = await self._build(Ability, data)
 
         return ret
 
-    @cached(128)
-    async def get_berry(self, query: Union[int, str]) -> Berry:
+    @cached()
+    async def get_berry(self, query: Union[int, str], priority: str = None) -> Berry:
         """Get a :class:`Berry` from the API.
         The query can be both the name or the ID as a string or integer.
 
@@ -242,6 +635,12 @@ class Client:
         query: Union[:class:`int`, :class:`str`]
             The name or id of the berry.
 
+        priority: Optional[:class:`str`]
+            The lane of the request, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority`.
+
+            .. versionadded:: 0.1.7a
+
         Raises
         ------
         PokeAPIException
@@ -255,14 +654,14 @@ class Client:
         -------
         :class:`Berry`
             The berry searched for."""
-        data = await self._http.get_berry(query)
+        data = await self._http.get_berry(query, priority)
 
-        ret = Berry(data)
+        ret = await self._build(Berry, data)
 
         return ret
 
-    @cached(128)
-    async def get_pokemon_color(self, query: Union[int, str]) -> PokemonColor:
+    @cached()
+    async def get_pokemon_color(self, query: Union[int, str], priority: str = None) -> PokemonColor:
         """Get a :class:`PokemonColor` from the API.
         The query can be both the name or the ID as a string or integer.
 
@@ -275,6 +674,12 @@ class Client:
         query: Union[:class:`int`, :class:`str`]
             The name or id of the color.
 
+        priority: Optional[:class:`str`]
+            The lane of the request, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority`.
+
+            .. versionadded:: 0.1.7a
+
         Raises
         ------
         PokeAPIException
@@ -288,14 +693,14 @@ class Client:
         -------
         :class:`PokemonColor`
             The color searched for."""
-        data = await self._http.get_pokemon_color(query)
+        data = await self._http.get_pokemon_color(query, priority)
 
-        ret = PokemonColor(data)
+        ret = await self._build(PokemonColor, data)
 
         return ret
 
-    @cached(128)
-    async def get_pokemon_habitat(self, query: Union[int, str]) -> PokemonHabitat:
+    @cached()
+    async def get_pokemon_habitat(self, query: Union[int, str], priority: str = None) -> PokemonHabitat:
         """Get a :class:`PokemonHabitat` from the API.
         The query can be both the name or the ID as a string or integer.
 
@@ -308,6 +713,12 @@ class Client:
         query: Union[:class:`int`, :class:`str`]
             The name or id of the habotat.
 
+        priority: Optional[:class:`str`]
+            The lane of the request, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority`.
+
+            .. versionadded:: 0.1.7a
+
         Raises
         ------
         PokeAPIException
@@ -321,14 +732,14 @@ class Client:
         -------
         :class:`PokemonHabitat`
             The habitat searched for."""
-        data = await self._http.get_pokemon_habitat(query)
+        data = await self._http.get_pokemon_habitat(query, priority)
 
-        ret = PokemonHabitat(data)
+        ret = await self._build(PokemonHabitat, data)
 
         return ret
 
-    @cached(128, with_name=False)
-    async def get_machine(self, query: Union[int, str]) -> Machine:
+    @cached(with_name=False)
+    async def get_machine(self, query: Union[int, str], priority: str = None) -> Machine:
         """Get a :class:`Machine` from the API.
         The query can **only** be the ID of the machine as a string or int.
 
@@ -341,6 +752,12 @@ class Client:
         query: Union[:class:`int`, :class:`str`]
             The id of the machine.
 
+        priority: Optional[:class:`str`]
+            The lane of the request, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority`.
+
+            .. versionadded:: 0.1.7a
+
         Raises
         ------
         PokeAPIException
@@ -354,9 +771,9 @@ class Client:
         -------
         :class:`Machine`
             The machine searched for."""
-        data = await self._http.get_machine(query)
+        data = await self._http.get_machine(query, priority)
 
-        ret = Machine(data)
+        ret = await self._build(Machine, data)
 
         return ret
 
@@ -414,15 +831,151 @@ class Client:
         -------
         :class:`bytes`
             The bytes read."""
-        try:
-            val = self._image_cache[url]
-        except KeyError:
-            val = io.BytesIO((await self._http.download_sprite(url)))
+        val = self._caches.sprites.get(url)
+
+        if val is None:
+            val = await self._http.download_sprite(url)
+
+            self._caches.sprites.put(url, val)
+
+        return val
+
+    async def build_index(self, *endpoints: str):
+        """Index the names and ids of every object of some endpoints, two requests per endpoint.
+
+        Afterwards ``get_`` queries are turned into ids without a request, so every spelling
+        of a name, e.g. ``Mr. Mime``, ``mr mime`` and ``mr-mime``, shares the same cache entry,
+        and queries for objects that don't exist raise :exc:`NotFound` without a request.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        endpoints: :class:`str`
+            The endpoints to index, e.g. ``pokemon`` or ``pokemon-color``.
+
+        Raises
+        ------
+        PokeAPIException
+            A request failed."""
+        for endpoint in endpoints:
+            count = (await self._http.get_pagination(endpoint, limit=1))["count"]
+            data = await self._http.get_pagination(endpoint, limit=max(count, 1))
+
+            self._caches.names.update(endpoint, data["results"], complete=True)
+
+    @property
+    def _relations(self) -> RelationIndex:
+        relations = self._caches.relations
+        if relations is None:
+            raise PokemonException("Relationships are not indexed, connect with index_relations=True.")
+
+        return relations
+
+    async def _move_id(self, query: Union[int, str]) -> int:
+        move = self._caches.names.resolve("move", _make_cache_key(query))
+        if isinstance(move, int):
+            return move
+
+        return (await self.get_move(query)).id
 
-            self._image_cache[url] = val
+    async def get_learners(self, move: Union[int, str]) -> List[NamedAPIObject]:
+        """Get the Pokémon that learn a move, among the ones fetched so far.
 
-        val.seek(0)
-        return val.read()
+        The move is fetched only if its name isn't known yet.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        move: Union[:class:`int`, :class:`str`]
+            The name or id of the move.
+
+        Raises
+        ------
+        PokemonException
+            The client wasn't connected with ``index_relations``.
+        NotFound
+            The move was not found.
+
+        Returns
+        -------
+        List[:class:`NamedAPIObject`]
+            The Pokémon, sorted by id."""
+        relations = self._relations
+        return relations.learners(await self._move_id(move))
+
+    async def get_ability_holders(self, ability: Union[int, str]) -> List[NamedAPIObject]:
+        """Get all the Pokémon that can have an ability.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        ability: Union[:class:`int`, :class:`str`]
+            The name or id of the ability.
+
+        Raises
+        ------
+        PokemonException
+            The client wasn't connected with ``index_relations``.
+        NotFound
+            The ability was not found.
+
+        Returns
+        -------
+        List[:class:`NamedAPIObject`]
+            The Pokémon, sorted by id."""
+        relations = self._relations
+        return relations.ability_holders((await self.get_ability(ability)).id)
+
+    async def get_item_holders(self, item: Union[int, str]) -> List[NamedAPIObject]:
+        """Get the Pokémon that can hold an item in the wild, among the ones fetched so far.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        item: Union[:class:`int`, :class:`str`]
+            The name or id of the item.
+
+        Raises
+        ------
+        PokemonException
+            The client wasn't connected with ``index_relations``.
+
+        Returns
+        -------
+        List[:class:`NamedAPIObject`]
+            The Pokémon, sorted by id, empty if the item is unknown."""
+        relations = self._relations
+        item = self._caches.names.resolve("item", _make_cache_key(item))
+
+        return relations.item_holders(item) if isinstance(item, int) else []
+
+    async def get_move_machines(self, move: Union[int, str]) -> List[APIObject]:
+        """Get all the machines that teach a move.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        move: Union[:class:`int`, :class:`str`]
+            The name or id of the move.
+
+        Raises
+        ------
+        PokemonException
+            The client wasn't connected with ``index_relations``.
+        NotFound
+            The move was not found.
+
+        Returns
+        -------
+        List[:class:`APIObject`]
+            The machines, use :meth:`get_machine` to get them."""
+        relations = self._relations
+        return relations.machines((await self.get_move(move)).id)
 
     def get_pagination(self, obj: str, **kwargs) -> AsyncPaginationIterator:
         """Retuns an async iterator representing a pagination of objects from the API.
@@ -437,6 +990,11 @@ class Client:
             The amount of the objects, defaults to ``20``.
         offset: Optional[:class:`int`]
             The start position of the pagination, defaults to ``0``.
+        priority: Optional[:class:`str`]
+            The lane of the requests, :data:`INTERACTIVE` or :data:`BATCH`,
+            defaults to the lane set with :func:`priority` when the iterator is consumed.
+
+            .. versionadded:: 0.1.7a
 
         Returns
         -------
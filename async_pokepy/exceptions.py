@@ -43,18 +43,26 @@ class PokeAPIException(PokemonException):
 
     Attributes
     ----------
-    response: :class:`aiohttp.ClientResponse`
-        The failed HTTP response.
+    response: Optional[:class:`Response`]
+        The failed HTTP response, ``None`` if the error was raised without making a request.
+
+        .. versionchanged:: 0.1.7a
+
+            This can now be ``None``, and is a :class:`Response` instead of an :class:`aiohttp.ClientResponse`.
     status: :class:`int`
         The HTTP status code.
     message: :class:`str`
         A, hopefully, useful exception message."""
+    status = None
 
     def __init__(self, response, message: str):
         self.response = response
-        self.status = response.status
 
-        self.message = "API responded with status code {0} {2}: {1}".format(self.status, message, response.reason)
+        if response is None:
+            self.message = message
+        else:
+            self.status = response.status
+            self.message = "API responded with status code {0} {2}: {1}".format(self.status, message, response.reason)
 
         super().__init__(self.message)
 
@@ -72,7 +80,11 @@ class RateLimited(PokeAPIException):
 class NotFound(PokeAPIException):
     """Exception raised when an HTTP request response code is equal to 404 NOT FOUND.
 
+    Also raised without a request when the :class:`NameIndex` knows every object
+    of an endpoint and the query isn't one of them.
+
     This inherits from :exc:`PokeAPIException`."""
+    status = 404
 
 
 class Forbidden(PokeAPIException):
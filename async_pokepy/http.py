@@ -25,14 +25,21 @@ DEALINGS IN THE SOFTWARE.
 """
 
 import asyncio
+import json
 import logging
+import random
 import sys
-from typing import Coroutine, Union
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Coroutine, Optional, Union
 from urllib.parse import quote
 
 import aiohttp
 
 from .exceptions import Forbidden, NotFound, PokeAPIException, RateLimited
+from .scheduling import _Limiter, _Scheduler, current_lane
+from .transport import AiohttpTransport
 from .utils import _fmt_param
 
 LOG = logging.getLogger(__name__)
@@ -40,109 +47,587 @@ LOG = logging.getLogger(__name__)
 __all__ = ()
 
 
+class _Payload(dict):
+    """A decoded JSON object that remembers the size of the response body it came from."""
+    __slots__ = ("nbytes",)
+
+
+def _decode(body: bytes, encoding: str, is_json: bool) -> Union[str, dict]:
+    data = body.decode(encoding)
+
+    if is_json:
+        data = json.loads(data)
+
+        if isinstance(data, dict):
+            data = _Payload(data)
+            data.nbytes = len(body)
+
+    return data
+
+
+class _Offloader:
+    """Runs CPU bound work inline or in an executor, depending on the size of its input.
+
+    Without a fixed threshold the work is offloaded once the time it took inline,
+    per byte, predicts it would block the event loop for more than ``budget`` seconds."""
+    __slots__ = ("executor", "threshold", "budget", "_rate")
+
+    def __init__(self, executor=None, threshold: int = None, budget: float = 0.001):
+        self.executor = executor
+        self.threshold = threshold
+        self.budget = budget
+
+        self._rate = None
+
+    def offloads(self, nbytes: int) -> bool:
+        if self.executor is None:
+            return False
+        if self.threshold is not None:
+            return nbytes >= self.threshold
+
+        return self._rate is not None and nbytes * self._rate > self.budget
+
+    async def run(self, loop, nbytes: int, func, *args):
+        if self.offloads(nbytes):
+            return await loop.run_in_executor(self.executor, func, *args)
+
+        if self.executor is None or self.threshold is not None:
+            return func(*args)
+
+        start = time.perf_counter()
+        ret = func(*args)
+
+        rate = (time.perf_counter() - start) / max(nbytes, 1)
+        self._rate = rate if self._rate is None else self._rate * 0.8 + rate * 0.2
+
+        return ret
+
+
+class _Hedger:
+    """Decides when to send a second, hedged, request for a slow one.
+
+    A request is hedged once it took longer than the ``percentile`` of the recent
+    latencies of its endpoint, as long as hedges stay under ``budget`` times the requests."""
+    __slots__ = ("percentile", "budget", "hedged", "won", "_latencies", "_delays", "_tokens")
+
+    MIN_SAMPLES = 20
+    WINDOW = 256
+    MAX_TOKENS = 10.0
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.05):
+        self.percentile = percentile
+        self.budget = budget
+
+        self.hedged = 0
+        self.won = 0
+
+        self._latencies = {}
+        self._delays = {}
+        self._tokens = 0.0
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        self._tokens = min(self._tokens + self.budget, self.MAX_TOKENS)
+
+        return self._delays.get(endpoint)
+
+    def spend(self) -> bool:
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        self.hedged += 1
+        return True
+
+    def record(self, endpoint: str, elapsed: float):
+        window = self._latencies.get(endpoint)
+        if window is None:
+            window = self._latencies[endpoint] = [deque(maxlen=self.WINDOW), 0]
+
+        latencies = window[0]
+        latencies.append(elapsed)
+        window[1] += 1
+
+        # Sorting the window on every request would cost more than the percentile is worth.
+        if window[1] >= self.MIN_SAMPLES and window[1] % 8 == 0:
+            ordered = sorted(latencies)
+            self._delays[endpoint] = ordered[min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)]
+
+
+class _Mirror:
+    """The load balancing and health state of one base url."""
+    __slots__ = ("base", "latency", "inflight", "failures", "down_until")
+
+    def __init__(self, base: str):
+        self.base = base
+
+        self.latency = None
+        self.inflight = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+    def __repr__(self) -> str:
+        return "<_Mirror base='{0.base}' latency={0.latency} inflight={0.inflight}>".format(self)
+
+    @property
+    def cost(self) -> float:
+        # A mirror without measurements is tried before the others, so it gets some.
+        return (self.latency or 0.0) * (self.inflight + 1)
+
+
+class _Balancer:
+    """Spreads requests across mirrors of the API with the power of two choices.
+
+    Two healthy mirrors are sampled at random and the one with the lowest
+    latency EWMA, scaled by its requests in flight, gets the request.
+    A mirror failing ``FAILURE_THRESHOLD`` times in a row is left out for a
+    cooldown that doubles every time it fails again after coming back."""
+    __slots__ = ("mirrors", "_random")
+
+    ALPHA = 0.3
+    FAILURE_THRESHOLD = 3
+    COOLDOWN = 5.0
+    MAX_COOLDOWN = 60.0
+
+    def __init__(self, bases):
+        self.mirrors = [_Mirror(base) for base in bases]
+        self._random = random.Random()
+
+    def pick(self, exclude: _Mirror = None) -> _Mirror:
+        now = time.monotonic()
+        healthy = [mirror for mirror in self.mirrors if mirror.down_until <= now and mirror is not exclude]
+
+        if not healthy:
+            # Everything is down, fail over to whatever should come back first.
+            return min((mirror for mirror in self.mirrors if mirror is not exclude), default=exclude,
+                       key=lambda mirror: mirror.down_until)
+        if len(healthy) == 1:
+            return healthy[0]
+
+        first, second = self._random.sample(healthy, 2)
+        return first if first.cost <= second.cost else second
+
+    def succeeded(self, mirror: _Mirror, elapsed: float):
+        if mirror.failures >= self.FAILURE_THRESHOLD:
+            LOG.info("Mirror %s is back up", mirror.base)
+
+        mirror.failures = 0
+        mirror.down_until = 0.0
+        mirror.latency = elapsed if mirror.latency is None else mirror.latency * (1 - self.ALPHA) + elapsed * self.ALPHA
+
+    def failed(self, mirror: _Mirror):
+        mirror.failures += 1
+
+        if mirror.failures >= self.FAILURE_THRESHOLD:
+            cooldown = min(self.COOLDOWN * 2 ** (mirror.failures - self.FAILURE_THRESHOLD), self.MAX_COOLDOWN)
+            mirror.down_until = time.monotonic() + cooldown
+
+            LOG.warning("Mirror %s failed %d times in a row, leaving it out for %.0fs", mirror.base, mirror.failures,
+                        cooldown)
+
+
+def _truncate(body: bytes, limit: int) -> str:
+    text = body[:limit].decode("utf-8", "replace")
+    if len(body) > limit:
+        return "{0}... ({1} bytes)".format(text, len(body))
+
+    return text
+
+
 class Route:
-    __slots__ = ("params", "url", "route")
+    __slots__ = ("params", "path", "url", "route")
 
     def __init__(self, base, *args, **kwargs):
         self.route = [_fmt_param(arg) for arg in args]
         self.params = ["{0}={1}".format(k, quote(str(v))) for k, v in kwargs.items()]
 
-        url = base + "/".join(self.route)
+        path = "/".join(self.route)
         if self.params:
-            self.url = url + "?" + "&".join(self.params)
+            self.path = path + "?" + "&".join(self.params)
         else:
-            self.url = url
+            self.path = path
+
+        self.url = base + self.path
+
+    def url_for(self, base: str) -> str:
+        """The same route on another mirror of the API."""
+        return base + self.path
+
+    def __repr__(self) -> str:
+        return "<Route url='{0.url}'>".format(self)
+
+    @property
+    def endpoint(self) -> str:
+        return self.route[0] if self.route else ""
 
 
 class HTTPPokemonClient:
-    __slots__ = ("loop", "headers", "_session", "_lock", "base")
+    __slots__ = (
+        "loop", "headers", "transport", "scheduler", "base", "tracers", "log_payload_limit", "log_summaries", "decoder",
+        "builder", "hedger", "balancer", "limiter", "_health_task"
+    )
 
     def __init__(self, base: str, **kwargs):
-        self.loop = kwargs.pop("loop", asyncio.get_event_loop())
+        self.loop = kwargs.pop("loop", None) or asyncio.get_event_loop()
 
-        self._lock = asyncio.Lock(loop=self.loop)
+        max_concurrency = kwargs.pop("max_concurrency", None)
 
-        self.base = base
-        self._session = kwargs.pop("session", None)
+        self.limiter = None
+        if kwargs.pop("adaptive_concurrency", False):
+            self.limiter = _Limiter(maximum=max_concurrency or 64)
+            max_concurrency = int(self.limiter.limit)
+
+        self.scheduler = _Scheduler(max_concurrency or 1, kwargs.pop("batch_share", 0.1))
+
+        bases = list(kwargs.pop("bases", None) or (base,))
+        self.base = bases[0]
         self.headers = {
             "User-Agent": kwargs.pop(
                 "user_agent", "Python/{0[0]}.{0[1]} aiohttp/{1}".format(sys.version_info, aiohttp.__version__))
         }
 
-    async def request(self, route, **kwargs) -> Union[str, dict]:
-        async with self._lock:
+        self.tracers = list(kwargs.pop("tracers", ()))
+
+        self.transport = kwargs.pop("transport", None)
+        if self.transport is None:
+            self.transport = AiohttpTransport(self.headers, session=kwargs.pop("session", None),
+                                              trace_configs=kwargs.pop("trace_configs", None))
+
+        self.log_payload_limit = kwargs.pop("log_payload_limit", 200)
+        self.log_summaries = kwargs.pop("log_summaries", False)
+
+        executor = kwargs.pop("executor", None)
+        threshold = kwargs.pop("offload_threshold", None)
+        self.decoder = _Offloader(executor, threshold)
+        # Objects come back from other processes pickled, i.e. not built yet, so they'd be built
+        # again on the event loop when first used.
+        self.builder = _Offloader(None if isinstance(executor, ProcessPoolExecutor) else executor, threshold)
+
+        self.hedger = None
+        if kwargs.pop("hedge", False):
+            self.hedger = _Hedger(kwargs.pop("hedge_percentile", 95.0), kwargs.pop("hedge_budget", 0.05))
+
+        self.balancer = None
+        self._health_task = None
+        if len(bases) > 1:
+            self.balancer = _Balancer(bases)
+
+            interval = kwargs.pop("health_check_interval", 10.0)
+            if interval:
+                self._health_task = self.loop.create_task(self._check_health(interval))
+
+    def trace(self, event: str, *args):
+        for tracer in self.tracers:
+            getattr(tracer, event)(*args)
+
+    async def _check_health(self, interval: float):
+        # Probes the mirrors left out, so they come back without a user request paying for the trial.
+        while True:
+            await asyncio.sleep(interval)
+
+            now = time.monotonic()
+            for mirror in self.balancer.mirrors:
+                if mirror.down_until <= now:
+                    continue
+
+                start = time.perf_counter()
+                try:
+                    resp = await asyncio.wait_for(self.transport.get(mirror.base), interval)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    LOG.debug("Health check of mirror %s failed", mirror.base, exc_info=True)
+                    continue
+
+                if resp.status < 500:
+                    self.balancer.succeeded(mirror, time.perf_counter() - start)
+
+    async def _fetch(self, route, mirror: Optional[_Mirror], **kwargs):
+        if mirror is None:
+            return await self.transport.get(route.url, **kwargs)
+
+        mirror.inflight += 1
+        start = time.perf_counter()
+        try:
+            resp = await self.transport.get(route.url_for(mirror.base), **kwargs)
+        except asyncio.CancelledError:
+            # Losing a hedge race says nothing about the health of the mirror.
+            raise
+        except Exception:
+            self.balancer.failed(mirror)
+            raise
+        finally:
+            mirror.inflight -= 1
+
+        if resp.status == 429 or resp.status >= 500:
+            self.balancer.failed(mirror)
+        else:
+            self.balancer.succeeded(mirror, time.perf_counter() - start)
+
+        return resp
+
+    async def _hedge(self, route, mirror: Optional[_Mirror], **kwargs):
+        try:
+            return await self._fetch(route, mirror, **kwargs)
+        finally:
+            self.scheduler.release()
+
+    async def _hedged_get(self, route, mirror: Optional[_Mirror], lane: str, **kwargs):
+        hedger = self.hedger
+        delay = hedger.delay(route.endpoint)
+        start = time.perf_counter()
+
+        first = asyncio.ensure_future(self._fetch(route, mirror, **kwargs))
+        pending = {first}
+
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+
+                # With mirrors, the hedge goes to another healthy one so a slow mirror isn't asked twice.
+                target = mirror
+                if not done and mirror is not None:
+                    target = self.balancer.pick(exclude=mirror)
+                    if target is mirror or target.down_until > time.monotonic():
+                        target = None
+
+                # The hedge needs a slot of its own, so it can't exceed the concurrency limit.
+                if not done and (mirror is None or target is not None) and self.scheduler.try_acquire(lane):
+                    if hedger.spend():
+                        LOG.debug("%s is slower than %.3fs, hedging it", route.url, delay)
+                        if self.tracers:
+                            self.trace("on_request_hedged", route, delay)
+
+                        pending.add(asyncio.ensure_future(self._hedge(route, target, **kwargs)))
+                    else:
+                        self.scheduler.release()
+
+            # The first response wins, errors only count if every request failed.
+            finished = []
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished.extend(done)
+                # Checking every exception also marks them as retrieved.
+                winner = [task for task in done if task.exception() is None][:1]
+
+                if winner or not pending:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        result = winner[0] if winner else finished[-1]
+
+        # The caller adapts the limit to the result, the other request that got an answer counts too.
+        if self.limiter is not None:
+            for task in finished:
+                if task is not result:
+                    self._adapt(route, None if task.exception() else task.result().status, None)
+
+        if not winner:
+            return result.result()
+
+        if result is not first:
+            hedger.won += 1
+
+        resp = result.result()
+        if resp.status < 500:
+            hedger.record(route.endpoint, time.perf_counter() - start)
+
+        return resp
+
+    def _adapt(self, route, status: Optional[int], elapsed: Optional[float]):
+        limiter = self.limiter
+        previous = int(limiter.limit)
+
+        if status is None or status == 429 or status >= 500:
+            limiter.failed()
+        else:
+            # The latency of paginations depends on their size, so they only count for errors.
+            limiter.succeeded(None if route.params else elapsed, self.scheduler.active)
+
+        limit = int(limiter.limit)
+        if limit != previous:
+            LOG.debug("Concurrency limit changed from %d to %d", previous, limit)
+            self.scheduler.resize(limit)
+
+            if self.tracers:
+                self.trace("on_concurrency_limit", limit)
+
+    async def request(self, route, lane: str = None, **kwargs) -> Union[str, dict]:
+        tracing = bool(self.tracers)
+        log_info = LOG.isEnabledFor(logging.INFO)
+        log_payload = self.log_payload_limit and LOG.isEnabledFor(logging.DEBUG)
+        timed = tracing or (log_info and self.log_summaries)
+
+        balancer = self.balancer
+        limiter = self.limiter
+        mirror = None
+
+        lane = lane or current_lane()
+        await self.scheduler.acquire(lane)
+        try:
             for tries in range(5):
-                async with self._session.get(route.url, **kwargs) as resp:
-                    LOG.info("%s %s returned %d %s status code", resp.method, resp.url, resp.status, resp.reason)
-
-                    data = (await resp.json() if "application/json" in resp.headers["Content-Type"]
-                            else await resp.text())
-
-                    if 300 > resp.status >= 200:
-                        LOG.debug("%s %s succeeded with data %s", resp.method, resp.url, data)
+                if timed:
+                    start = time.perf_counter()
+                if tracing:
+                    self.trace("on_request_start", route, tries)
+
+                if balancer is not None:
+                    # Retries go to another mirror than the one which just failed.
+                    mirror = balancer.pick(exclude=mirror if tries else None)
+                if limiter is not None:
+                    sent = time.perf_counter()
+
+                try:
+                    if self.hedger is None:
+                        resp = await self._fetch(route, mirror, **kwargs)
+                    else:
+                        resp = await self._hedged_get(route, mirror, lane, **kwargs)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    if tracing:
+                        self.trace("on_request_error", route, exc, time.perf_counter() - start)
+                    if limiter is not None:
+                        self._adapt(route, None, None)
+
+                    if balancer is None or tries == 4:
+                        raise
+
+                    LOG.warning("Request to mirror %s failed, failing over", mirror.base, exc_info=True)
+                    continue
+
+                if limiter is not None:
+                    self._adapt(route, resp.status, time.perf_counter() - sent)
+
+                body = resp.body
+
+                if tracing:
+                    decode_start = time.perf_counter()
+
+                data = await self.decoder.run(self.loop, len(body), _decode, body, resp.encoding,
+                                              "application/json" in resp.headers.get("Content-Type", ""))
+
+                if timed:
+                    end = time.perf_counter()
+                if tracing:
+                    self.trace("on_decode", route, end - decode_start)
+                    self.trace("on_request_end", route, resp.status, end - start, len(body))
+
+                if log_info:
+                    if self.log_summaries:
+                        self._log_summary(route, resp, end - start, len(body), tries)
+                    else:
+                        LOG.info("%s %s returned %d %s status code", resp.method, route.url, resp.status,
+                                 resp.reason)
+
+                if 300 > resp.status >= 200:
+                    if log_payload:
+                        LOG.debug("%s %s succeeded with data %s", resp.method, route.url,
+                                  _truncate(body, self.log_payload_limit))
+
+                    return data
+
+                if resp.status == 429:
+                    # Other mirrors have their own rate limits.
+                    if balancer is not None and tries < len(balancer.mirrors) - 1:
+                        LOG.warning("Mirror %s is rate limited, failing over", mirror.base)
+
+                        if tracing:
+                            self.trace("on_request_retry", route, resp.status, tries, 0)
+                        continue
 
-                        return data
+                    LOG.error("Surpassed 100 API requests in one minute")
 
-                    if resp.status == 429:
-                        LOG.error("Surpassed 100 API requests in one minute")
+                    if tracing:
+                        self.trace("on_rate_limited", route)
 
-                        raise RateLimited(resp, "Surpassed 100 API requests in one minute.")
+                    raise RateLimited(resp, "Surpassed 100 API requests in one minute.")
 
-                    if resp.status in {500, 502}:
+                if resp.status in {500, 502}:
+                    # Every other mirror can be asked right away before backing off.
+                    if balancer is not None and tries < len(balancer.mirrors) - 1:
+                        sleep_time = 0
+                    else:
                         sleep_time = 1 + tries * 2
-                        LOG.warning("Internal API error, retrying in %d", sleep_time)
+                    LOG.warning("Internal API error, retrying in %d", sleep_time)
 
-                        await asyncio.sleep(sleep_time, loop=self.loop)
-                        continue
+                    if tracing:
+                        self.trace("on_request_retry", route, resp.status, tries, sleep_time)
 
-                    if resp.status == 403:
-                        raise Forbidden(resp, "Forbidden endpoint.")
-                    if resp.status == 404:
-                        raise NotFound(resp, "Endpoint not found.")
+                    await asyncio.sleep(sleep_time)
+                    continue
 
-                    raise PokeAPIException(resp, "Uncaught status code.")
+                if resp.status == 403:
+                    raise Forbidden(resp, "Forbidden endpoint.")
+                if resp.status == 404:
+                    raise NotFound(resp, "Endpoint not found.")
+
+                raise PokeAPIException(resp, "Uncaught status code.")
 
             LOG.critical("Request timed out")
             raise PokeAPIException(resp, "Request timed out.")
+        finally:
+            self.scheduler.release()
+
+    @staticmethod
+    def _log_summary(route, resp, elapsed: float, nbytes: int, attempt: int):
+        summary = {
+            "method": resp.method,
+            "url": route.url,
+            "endpoint": route.endpoint,
+            "status": resp.status,
+            "elapsed": elapsed,
+            "nbytes": nbytes,
+            "attempt": attempt,
+        }
 
-    async def connect(self):
-        if not self._session or self._session.closed:
-            self._session = aiohttp.ClientSession(headers=self.headers, loop=self.loop)
+        LOG.info("%s %s returned %d in %.3fs", resp.method, route.url, resp.status, elapsed,
+                 extra={"pokeapi_request": summary})
 
     async def close(self):
-        await self._session.close()
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        await self.transport.close()
 
     async def download_sprite(self, url: str) -> bytes:
-        async with self._session.get(url) as resp:
-            if resp.status == 200:
-                return await resp.read()
-            if resp.status == 404:
-                raise NotFound(resp, "Sprite not found.")
-            if resp.status == 403:
-                raise Forbidden(resp, "Cannot retrieve the sprite.")
+        resp = await self.transport.get(url)
+
+        if resp.status == 200:
+            return resp.body
+        if resp.status == 404:
+            raise NotFound(resp, "Sprite not found.")
+        if resp.status == 403:
+            raise Forbidden(resp, "Cannot retrieve the sprite.")
 
-            raise PokeAPIException(resp, "Failed to get the sprite.")
+        raise PokeAPIException(resp, "Failed to get the sprite.")
 
-    def get_pokemon(self, query: Union[int, str]) -> Coroutine:
-        return self.request(Route(self.base, "pokemon", query))
+    def get_pokemon(self, query: Union[int, str], lane: str = None) -> Coroutine:
+        return self.request(Route(self.base, "pokemon", query), lane)
 
-    def get_pokemon_color(self, query: Union[int, str]) -> Coroutine:
-        return self.request(Route(self.base, "pokemon-color", query))
+    def get_pokemon_color(self, query: Union[int, str], lane: str = None) -> Coroutine:
+        return self.request(Route(self.base, "pokemon-color", query), lane)
 
-    def get_pokemon_habitat(self, query: Union[int, str]) -> Coroutine:
-        return self.request(Route(self.base, "pokemon-habitat", query))
+    def get_pokemon_habitat(self, query: Union[int, str], lane: str = None) -> Coroutine:
+        return self.request(Route(self.base, "pokemon-habitat", query), lane)
 
-    def get_move(self, query: Union[int, str]) -> Coroutine:
-        return self.request(Route(self.base, "move", query))
+    def get_move(self, query: Union[int, str], lane: str = None) -> Coroutine:
+        return self.request(Route(self.base, "move", query), lane)
 
-    def get_ability(self, query: Union[int, str]) -> Coroutine:
-        return self.request(Route(self.base, "ability", query))
+    def get_ability(self, query: Union[int, str], lane: str = None) -> Coroutine:
+        return self.request(Route(self.base, "ability", query), lane)
 
-    def get_berry(self, query: Union[int, str]) -> Coroutine:
-        return self.request(Route(self.base, "berry", query))
+    def get_berry(self, query: Union[int, str], lane: str = None) -> Coroutine:
+        return self.request(Route(self.base, "berry", query), lane)
 
-    def get_machine(self, query: int) -> Coroutine:
-        return self.request(Route(self.base, "machine", query))
+    def get_machine(self, query: int, lane: str = None) -> Coroutine:
+        return self.request(Route(self.base, "machine", query), lane)
 
-    def get_pagination(self, query: str, **kwargs) -> Coroutine:
-        return self.request(Route(self.base, query, **kwargs))
+    def get_pagination(self, query: str, lane: str = None, **kwargs) -> Coroutine:
+        return self.request(Route(self.base, query, **kwargs), lane)
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from typing import Iterable, List, Optional, Union
+from urllib.parse import unquote
+
+from .types import Ability, APIObject, Machine, Move, NamedAPIObject, Pokemon
+from .utils import _alias_key, _fmt_param
+
+__all__ = ("NameIndex", "RelationIndex")
+
+
+class NameIndex:
+    """Maps the names and ids of the objects of each endpoint to their canonical id.
+
+    Names are matched exactly first, e.g. ``mr-mime`` or ``Mr Mime``, and then ignoring
+    accents, case and punctuation, e.g. ``Mr. Mime`` or ``MRMIME``, so every spelling
+    of a name shares the same cache entry and request.
+
+    Filled by :meth:`Client.build_index` and with every object fetched by a ``get_`` method.
+
+    .. versionadded:: 0.1.7a
+
+    .. container:: operations
+
+        .. describe:: y in x
+
+            Check if an endpoint has been indexed, completely or not."""
+    __slots__ = ("_aliases", "_ids", "_complete")
+
+    def __init__(self):
+        self._aliases = {}
+        self._ids = {}
+        self._complete = set()
+
+    def __repr__(self) -> str:
+        return "<NameIndex endpoints={0}>".format(sorted(self._ids))
+
+    def __contains__(self, endpoint: str) -> bool:
+        return endpoint in self._ids
+
+    def add(self, endpoint: str, name: Optional[str], id: int):  # pylint: disable=redefined-builtin
+        """Add an object to the index.
+
+        Parameters
+        ----------
+        endpoint: :class:`str`
+            The endpoint of the object, e.g. ``pokemon``.
+        name: Optional[:class:`str`]
+            The name of the object, in any spelling.
+        id: :class:`int`
+            The id of the object."""
+        self._ids.setdefault(endpoint, set()).add(id)
+
+        if name is not None:
+            aliases = self._aliases.setdefault(endpoint, {})
+
+            # Exact names always win over the loose spelling of another name.
+            aliases[_fmt_param(name)] = id
+            aliases.setdefault(_alias_key(name), id)
+
+    def update(self, endpoint: str, results: Iterable[dict], *, complete: bool = False):
+        """Add the results of a pagination to the index.
+
+        Parameters
+        ----------
+        endpoint: :class:`str`
+            The endpoint of the pagination, e.g. ``pokemon``.
+        results: Iterable[:class:`dict`]
+            The ``results`` of the API response.
+        complete: :class:`bool`
+            Whether the results are all the objects of the endpoint.
+            Queries for other objects of a complete endpoint are rejected without a request."""
+        for result in results:
+            self.add(endpoint, result.get("name"), int(result["url"].split("/")[-2]))
+
+        if complete:
+            self._complete.add(endpoint)
+
+    def is_complete(self, endpoint: str) -> bool:
+        """Check if all the objects of an endpoint are indexed.
+
+        Parameters
+        ----------
+        endpoint: :class:`str`
+            The endpoint, e.g. ``pokemon``.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether it's complete."""
+        return endpoint in self._complete
+
+    def resolve(self, endpoint: str, query: Union[int, str]) -> Union[int, str, None]:
+        """Get the id of an object.
+
+        Parameters
+        ----------
+        endpoint: :class:`str`
+            The endpoint of the object, e.g. ``pokemon``.
+        query: Union[:class:`int`, :class:`str`]
+            The name or id of the object, already normalized with the cache key rules.
+
+        Returns
+        -------
+        Union[:class:`int`, :class:`str`, None]
+            The id, ``query`` if the object is unknown or ``None`` if
+            the endpoint is complete and the object doesn't exist."""
+        complete = endpoint in self._complete
+
+        if not isinstance(query, str):
+            return query if not complete or query in self._ids.get(endpoint, ()) else None
+
+        aliases = self._aliases.get(endpoint, {})
+
+        found = aliases.get(query)
+        if found is None:
+            # The loose spelling is of the name itself, not of its percent-encoded form.
+            found = aliases.get(_alias_key(unquote(query)))
+
+        if found is not None:
+            return found
+
+        return None if complete else query
+
+    def clear(self):
+        """Remove all endpoints from the index."""
+        self._aliases.clear()
+        self._ids.clear()
+        self._complete.clear()
+
+
+class RelationIndex:
+    """Inverted maps of the relationships between the objects fetched so far.
+
+    Every :class:`Pokemon`, :class:`Ability`, :class:`Move` and :class:`Machine` added,
+    automatically when fetched by a :class:`Client` connected with ``index_relations``,
+    updates the maps so questions like "which Pokémon learn Thunderbolt" are answered
+    without fetching every Pokémon again.
+
+    The Pokémon known to learn a move or hold an item are only the ones added, while
+    an :class:`Ability` lists all its Pokémon and a :class:`Move` all its machines.
+
+    The names of the moves, abilities and items seen are also added to the :class:`NameIndex`.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    names: Optional[:class:`NameIndex`]
+        The name index to fill, if any."""
+    __slots__ = ("names", "_learners", "_ability_holders", "_item_holders", "_machines", "_pokemon")
+
+    def __init__(self, names: Optional[NameIndex] = None):
+        self.names = names
+
+        self._learners = {}
+        self._ability_holders = {}
+        self._item_holders = {}
+        self._machines = {}
+        self._pokemon = {}
+
+    def __repr__(self) -> str:
+        return "<RelationIndex pokemon={0} moves={1}>".format(len(self._pokemon), len(self._learners))
+
+    def _link(self, relation: dict, key: int, value: int):
+        relation.setdefault(key, set()).add(value)
+
+    def _name(self, endpoint: str, obj: NamedAPIObject):
+        if self.names is not None:
+            self.names.add(endpoint, obj.name, obj.id)
+
+    def add(self, obj):
+        """Add an object to the index, objects of other types are ignored.
+
+        Adding the same object again is harmless.
+
+        Parameters
+        ----------
+        obj: Union[:class:`Pokemon`, :class:`Ability`, :class:`Move`, :class:`Machine`]
+            The object."""
+        if isinstance(obj, Pokemon):
+            self._pokemon[obj.id] = _fmt_param(obj.name)
+
+            for move in obj.moves:
+                self._link(self._learners, move.move.id, obj.id)
+                self._name("move", move.move)
+
+            for ability in obj.abilities:
+                self._link(self._ability_holders, ability.ability.id, obj.id)
+                self._name("ability", ability.ability)
+
+            for item in obj.held_items:
+                self._link(self._item_holders, item.item.id, obj.id)
+                self._name("item", item.item)
+
+        elif isinstance(obj, Ability):
+            for pokemon in obj.pokemon:
+                self._pokemon.setdefault(pokemon.pokemon.id, _fmt_param(pokemon.pokemon.name))
+                self._link(self._ability_holders, obj.id, pokemon.pokemon.id)
+
+        elif isinstance(obj, Move):
+            for detail in obj.machines:
+                self._link(self._machines, obj.id, detail.machine.id)
+
+        elif isinstance(obj, Machine):
+            self._link(self._machines, obj.move.id, obj.id)
+            self._name("move", obj.move)
+            self._name("item", obj.item)
+
+    def update(self, objects: Iterable):
+        """Add many objects to the index, e.g. loaded from a snapshot.
+
+        Parameters
+        ----------
+        objects: Iterable[Union[:class:`Pokemon`, :class:`Ability`, :class:`Move`, :class:`Machine`]]
+            The objects."""
+        for obj in objects:
+            self.add(obj)
+
+    def _pokemon_list(self, ids: Iterable[int]) -> List[NamedAPIObject]:
+        return [NamedAPIObject({"name": self._pokemon[key], "url": "pokemon/{0}/".format(key)}) for key in sorted(ids)]
+
+    def learners(self, move: int) -> List[NamedAPIObject]:
+        """Get the Pokémon added so far that learn a move.
+
+        Parameters
+        ----------
+        move: :class:`int`
+            The id of the move.
+
+        Returns
+        -------
+        List[:class:`NamedAPIObject`]
+            The Pokémon, sorted by id."""
+        return self._pokemon_list(self._learners.get(move, ()))
+
+    def ability_holders(self, ability: int) -> List[NamedAPIObject]:
+        """Get the Pokémon that can have an ability.
+
+        Parameters
+        ----------
+        ability: :class:`int`
+            The id of the ability.
+
+        Returns
+        -------
+        List[:class:`NamedAPIObject`]
+            The Pokémon, sorted by id."""
+        return self._pokemon_list(self._ability_holders.get(ability, ()))
+
+    def item_holders(self, item: int) -> List[NamedAPIObject]:
+        """Get the Pokémon added so far that can hold an item in the wild.
+
+        Parameters
+        ----------
+        item: :class:`int`
+            The id of the item.
+
+        Returns
+        -------
+        List[:class:`NamedAPIObject`]
+            The Pokémon, sorted by id."""
+        return self._pokemon_list(self._item_holders.get(item, ()))
+
+    def machines(self, move: int) -> List[APIObject]:
+        """Get the machines that teach a move.
+
+        Parameters
+        ----------
+        move: :class:`int`
+            The id of the move.
+
+        Returns
+        -------
+        List[:class:`APIObject`]
+            The machines, sorted by id."""
+        return [APIObject({"url": "machine/{0}/".format(key)}) for key in sorted(self._machines.get(move, ()))]
+
+    def clear(self):
+        """Remove all relationships from the index."""
+        self._learners.clear()
+        self._ability_holders.clear()
+        self._item_holders.clear()
+        self._machines.clear()
+        self._pokemon.clear()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+
+from .exceptions import PokemonException
+from .utils import _make_cache_key
+
+__all__ = ("BatchLoader",)
+
+
+class BatchLoader:
+    """Resolves references to full objects in batches, used by :meth:`Client.resolve`.
+
+    Every reference requested during the same iteration of the event loop is
+    collected, duplicates are merged, cached objects are returned right away
+    and the others are fetched concurrently once the iteration ends.
+
+    .. versionadded:: 0.1.7a
+
+    Attributes
+    ----------
+    batches: :class:`int`
+        The number of batches dispatched.
+    loaded: :class:`int`
+        The number of unique references dispatched.
+    merged: :class:`int`
+        The number of references merged with another one of the same batch."""
+    __slots__ = ("batches", "loaded", "merged", "_client", "_queue", "_handle")
+
+    def __init__(self, client):
+        self.batches = 0
+        self.loaded = 0
+        self.merged = 0
+
+        self._client = client
+        self._queue = {}
+        self._handle = None
+
+    def __repr__(self) -> str:
+        return "<BatchLoader batches={0.batches} loaded={0.loaded} merged={0.merged}>".format(self)
+
+    def load(self, endpoint: str, query) -> "asyncio.Future":
+        """Schedule the load of an object.
+
+        Parameters
+        ----------
+        endpoint: :class:`str`
+            The endpoint of the object, e.g. ``pokemon-color``.
+        query: Union[:class:`int`, :class:`str`]
+            The id or name of the object.
+
+        Raises
+        ------
+        PokemonException
+            There is no ``get_`` method for the endpoint.
+
+        Returns
+        -------
+        :class:`asyncio.Future`
+            A future with the object."""
+        method = "get_" + endpoint.replace("-", "_")
+        if not hasattr(self._client, method):
+            raise PokemonException("Objects of the {0} endpoint cannot be resolved.".format(endpoint))
+
+        key = (method, _make_cache_key(query))
+
+        try:
+            future = self._queue[key]
+        except KeyError:
+            pass
+        else:
+            self.merged += 1
+            return future
+
+        loop = asyncio.get_event_loop()
+        future = self._queue[key] = loop.create_future()
+
+        if self._handle is None:
+            self._handle = loop.call_soon(self._dispatch)
+
+        return future
+
+    def _dispatch(self):
+        queue, self._queue = self._queue, {}
+        self._handle = None
+
+        self.batches += 1
+        self.loaded += len(queue)
+
+        caches = self._client.caches
+
+        for key, future in queue.items():
+            method, query = key
+            cache = caches[method]
+
+            # The get_ method counts its own miss.
+            value = cache.get(query) if query in cache else None
+
+            if value is not None:
+                future.set_result(value)
+            else:
+                task = asyncio.ensure_future(getattr(self._client, method)(query))
+                task.add_done_callback(lambda task, future=future: _chain(task, future))
+
+
+def _chain(task: "asyncio.Future", future: "asyncio.Future"):
+    if future.cancelled():
+        return
+
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from .client import connect
+from .testing import StubServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+__all__ = ("LoadTest", "run")
+
+SPRITES_PREFIX = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/"
+
+
+def _rss() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, AttributeError):
+        pass
+
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak, not current.
+
+    return None
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+
+    samples = sorted(samples)
+    last = len(samples) - 1
+
+    return {
+        "p50": samples[int(last * 0.5)],
+        "p90": samples[int(last * 0.9)],
+        "p99": samples[int(last * 0.99)],
+        "max": samples[last],
+    }
+
+
+class ZipfSampler:
+    """Picks items with a Zipf distribution, the first items being the most popular."""
+    __slots__ = ("items", "_cumulative", "_random")
+
+    def __init__(self, items: list, exponent: float, rng: random.Random):
+        self.items = items
+        self._cumulative = list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, len(items) + 1)))
+        self._random = rng
+
+    def sample(self):
+        point = self._random.random() * self._cumulative[-1]
+        return self.items[bisect.bisect_left(self._cumulative, point)]
+
+
+class LoadTest:
+    """Drives a :class:`Client` with a mix of operations for a fixed duration.
+
+    The supported operations are:
+
+    * ``get_pokemon``: a Pokémon picked with a Zipf distribution from the ``pokemon`` pagination.
+    * ``pagination``: a full scan of the ``pokemon`` pagination, ``page_size`` objects at a time.
+    * ``sprite``: :meth:`Client.read_sprite` of a Zipf picked Pokémon's front sprite.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    base: :class:`str`
+        The base url of the API, e.g. the one of a :class:`~async_pokepy.testing.StubServer`.
+    mix: Dict[:class:`str`, :class:`float`]
+        The relative weight of each operation.
+    duration: :class:`float`
+        How many seconds to run for.
+    concurrency: :class:`int`
+        How many operations run at the same time.
+    zipf: :class:`float`
+        The exponent of the Zipf distribution, higher means fewer hot Pokémon.
+    population: Optional[:class:`int`]
+        How many Pokémon to pick from, defaults to all of them.
+    page_size: :class:`int`
+        The ``limit`` of pagination scans.
+    sprite_base: Optional[:class:`str`]
+        Replaces the PokeAPI sprites url prefix, e.g. with
+        :attr:`~async_pokepy.testing.StubServer.sprite_base`.
+    seed: Optional[:class:`int`]
+        The seed of the random number generator.
+    client_options
+        Passed to :func:`connect`, e.g. ``cache_size``."""
+
+    def __init__(self, base: str, *, mix: Dict[str, float], duration: float = 30, concurrency: int = 10,
+                 zipf: float = 1.1, population: Optional[int] = None, page_size: int = 50,
+                 sprite_base: Optional[str] = None, seed: Optional[int] = None, **client_options):
+        unknown = set(mix) - {"get_pokemon", "pagination", "sprite"}
+        if unknown:
+            raise ValueError("Unknown operations: {0}".format(", ".join(sorted(unknown))))
+
+        self.base = base
+        self.mix = mix
+        self.duration = duration
+        self.concurrency = concurrency
+        self.zipf = zipf
+        self.population = population
+        self.page_size = page_size
+        self.sprite_base = sprite_base
+        self.client_options = client_options
+
+        self._random = random.Random(seed)
+        self._client = None
+        self._names = None
+        self._latencies = defaultdict(list)
+        self._errors = Counter()
+        self._lag = []
+
+    async def _get_pokemon(self):
+        await self._client.get_pokemon(self._names.sample())
+
+    async def _pagination(self):
+        await self._client.get_pagination("pokemon", limit=self.page_size).flatten()
+
+    async def _sprite(self):
+        pokemon = await self._client.get_pokemon(self._names.sample())
+
+        url = pokemon.sprites.front_default
+        if url is None:
+            return
+        if self.sprite_base is not None:
+            url = url.replace(SPRITES_PREFIX, self.sprite_base)
+
+        await self._client.read_sprite(url)
+
+    async def _worker(self, deadline: float):
+        operations = list(self.mix)
+        cumulative = list(itertools.accumulate(self.mix[op] for op in operations))
+
+        while time.perf_counter() < deadline:
+            name = operations[bisect.bisect_left(cumulative, self._random.random() * cumulative[-1])]
+
+            start = time.perf_counter()
+            try:
+                await getattr(self, "_" + name)()
+            except Exception as exc:
+                # Connection errors and timeouts are results too, they mustn't stop the worker.
+                self._errors[(name, type(exc).__name__)] += 1
+            else:
+                self._latencies[name].append(time.perf_counter() - start)
+
+    async def _monitor_lag(self, interval: float = 0.01):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self._lag.append(max(time.perf_counter() - start - interval, 0))
+
+    async def run(self) -> dict:
+        """Run the load test.
+
+        Returns
+        -------
+        :class:`dict`
+            The report, with throughput, latency percentiles in seconds,
+            errors, cache statistics, the final concurrency limit, memory and event loop lag."""
+        async with connect(self.base, **self.client_options) as client:
+            self._client = client
+
+            names = [obj.name for obj in await client.get_pagination("pokemon", limit=100000).flatten()]
+            self._names = ZipfSampler(names[:self.population], self.zipf, self._random)
+
+            rss_start = _rss()
+            monitor = asyncio.ensure_future(self._monitor_lag())
+
+            start = time.perf_counter()
+            deadline = start + self.duration
+            await asyncio.gather(*[self._worker(deadline) for _ in range(self.concurrency)])
+            elapsed = time.perf_counter() - start
+
+            monitor.cancel()
+            try:
+                await monitor
+            except asyncio.CancelledError:
+                pass
+            rss_end = _rss()
+
+            info = client.cache_info()
+            concurrency_limit = client.concurrency_limit
+
+        operations = {}
+        for name, samples in self._latencies.items():
+            operations[name] = dict(_percentiles(samples), count=len(samples), throughput=len(samples) / elapsed)
+
+        caches = {}
+        for name, stats in info.items():
+            lookups = stats.hits + stats.misses
+            caches[name] = dict(stats._asdict(), hit_rate=stats.hits / lookups if lookups else None)
+
+        return {
+            "elapsed": elapsed,
+            "throughput": sum(len(samples) for samples in self._latencies.values()) / elapsed,
+            "operations": operations,
+            "errors": {"{0}: {1}".format(*key): count for key, count in self._errors.items()},
+            "caches": caches,
+            "concurrency_limit": concurrency_limit,
+            "memory": {
+                "rss_start": rss_start,
+                "rss_end": rss_end,
+                "rss_growth": rss_end - rss_start if rss_start is not None and rss_end is not None else None,
+            },
+            "loop_lag": _percentiles(self._lag),
+        }
+
+
+async def run(base: Optional[str] = None, *, fixtures: Optional[str] = None, **kwargs) -> dict:
+    """Run a :class:`LoadTest`, against a :class:`~async_pokepy.testing.StubServer` if ``fixtures`` is passed.
+
+    The stub server runs on the same event loop as the client, so its work
+    shows up in the event loop lag, use a separate stub process for precise lag numbers.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    base: Optional[:class:`str`]
+        The base url of the API, ignored if ``fixtures`` is passed.
+    fixtures: Optional[:class:`str`]
+        The fixtures directory of the stub server, which synthesizes missing Pokémon.
+    kwargs
+        Passed to :class:`LoadTest`.
+
+    Returns
+    -------
+    :class:`dict`
+        The report."""
+    if fixtures is None:
+        return await LoadTest(base, **kwargs).run()
+
+    async with StubServer(fixtures, synthesize=True) as server:
+        kwargs.setdefault("sprite_base", server.sprite_base)
+
+        report = await LoadTest(server.base, **kwargs).run()
+        report["upstream_requests"] = dict(server.requests)
+
+        return report
+
+
+def _parse_mix(thing: str) -> Dict[str, float]:
+    mix = {}
+
+    for part in thing.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+
+    return mix
+
+
+def _print_report(report: dict):
+    print("Ran for {0:.1f}s, {1:.1f} operations/s".format(report["elapsed"], report["throughput"]))
+
+    for name, stats in sorted(report["operations"].items()):
+        print("  {0:<12} {1[count]:>8} ops {1[throughput]:>9.1f}/s  p50 {2:.2f}ms p90 {3:.2f}ms p99 {4:.2f}ms "
+              "max {5:.2f}ms".format(name, stats, stats["p50"] * 1000, stats["p90"] * 1000, stats["p99"] * 1000,
+                                     stats["max"] * 1000))
+
+    for error, count in sorted(report["errors"].items()):
+        print("  error {0}: {1}".format(error, count))
+
+    print("Caches:")
+    for name, stats in sorted(report["caches"].items()):
+        hit_rate = "-" if stats["hit_rate"] is None else "{0:.1%}".format(stats["hit_rate"])
+        print("  {0:<20} hit rate {1:>6}  size {2[currsize]}/{2[maxsize]}  {2[nbytes]} bytes  "
+              "{2[evictions]} evictions  {2[coalesced]} coalesced".format(name, hit_rate, stats))
+
+    print("Concurrency limit: {0}".format(report["concurrency_limit"]))
+
+    memory = report["memory"]
+    if memory["rss_growth"] is not None:
+        print("Memory: RSS {0:.1f}MiB -> {1:.1f}MiB ({2:+.1f}MiB)".format(
+            memory["rss_start"] / 2 ** 20, memory["rss_end"] / 2 ** 20, memory["rss_growth"] / 2 ** 20))
+
+    lag = report["loop_lag"]
+    if lag:
+        print("Event loop lag: p50 {0:.2f}ms p99 {1:.2f}ms max {2:.2f}ms".format(
+            lag["p50"] * 1000, lag["p99"] * 1000, lag["max"] * 1000))
+
+    if "upstream_requests" in report:
+        print("Upstream requests: {0}".format(report["upstream_requests"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m async_pokepy.loadtest")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base", help="the base url of the API to test, e.g. a self-hosted mirror")
+    target.add_argument("--fixtures", help="run a stub server from this fixtures directory and test against it")
+
+    parser.add_argument("--mix", type=_parse_mix, default="get_pokemon=8,pagination=1,sprite=1",
+                        help="comma separated operation=weight pairs (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--population", type=int)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--sprite-base")
+    parser.add_argument("--cache-size", type=int)
+    parser.add_argument("--cache-budget", type=int, help="the memory budget of all caches in bytes")
+    parser.add_argument("--max-concurrency", type=int, help="the maximum number of requests in flight")
+    parser.add_argument("--adaptive-concurrency", action="store_true",
+                        help="adapt the number of requests in flight to the API, up to --max-concurrency")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+    args = parser.parse_args(argv)
+
+    kwargs = {
+        "mix": args.mix,
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "zipf": args.zipf,
+        "population": args.population,
+        "page_size": args.page_size,
+        "seed": args.seed,
+    }
+    if args.sprite_base is not None:
+        kwargs["sprite_base"] = args.sprite_base
+    if args.cache_size is not None:
+        kwargs["cache_size"] = args.cache_size
+    if args.cache_budget is not None:
+        kwargs["cache_budget"] = args.cache_budget
+    if args.max_concurrency is not None:
+        kwargs["max_concurrency"] = args.max_concurrency
+    if args.adaptive_concurrency:
+        kwargs["adaptive_concurrency"] = True
+
+    loop = asyncio.get_event_loop()
+    report = loop.run_until_complete(run(args.base, fixtures=args.fixtures, **kwargs))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import contextlib
+from collections import deque, namedtuple
+from typing import Dict, Optional
+
+from .exceptions import PokemonException
+
+try:
+    import contextvars
+except ImportError:  # Python < 3.7
+    contextvars = None
+
+__all__ = ("INTERACTIVE", "BATCH", "LaneInfo", "priority")
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+LaneInfo = namedtuple("LaneInfo", "queued served")
+
+_current = contextvars.ContextVar("async_pokepy_priority", default=INTERACTIVE) if contextvars else None
+
+
+@contextlib.contextmanager
+def priority(lane: Optional[str]):
+    """A context manager setting the lane of the API requests made inside it, in the current task
+    and the tasks it creates, see the ``batch_share`` parameter of :func:`connect`.
+
+    Requests are in the :data:`INTERACTIVE` lane by default.
+    Background work, e.g. crawling paginations or warming caches, should use the
+    :data:`BATCH` lane so it doesn't delay the requests someone is waiting for.
+
+    The ``get_`` methods of :class:`Client` also take a ``priority`` keyword argument for a single call,
+    which works on every Python version.
+
+    Requires Python 3.7 or later.
+
+    .. versionadded:: 0.1.7a
+
+    .. code-block:: python3
+
+        with async_pokepy.priority(async_pokepy.BATCH):
+            async for pokemon in client.get_pagination("pokemon", limit=1000):
+                ...
+
+    Parameters
+    ----------
+    lane: Optional[:class:`str`]
+        Either :data:`INTERACTIVE` or :data:`BATCH`, ``None`` keeps the current lane.
+
+    Raises
+    ------
+    ValueError
+        The lane doesn't exist.
+    PokemonException
+        Python is older than 3.7."""
+    if lane is None:
+        yield
+        return
+
+    _check_lane(lane)
+    if _current is None:
+        raise PokemonException("Priority lanes require Python 3.7 or later.")
+
+    token = _current.set(lane)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def _check_lane(lane: Optional[str]):
+    if lane is not None and lane not in (INTERACTIVE, BATCH):
+        raise ValueError("Unknown priority lane {0!r}.".format(lane))
+
+
+def current_lane() -> str:
+    return _current.get() if _current is not None else INTERACTIVE
+
+
+class _Scheduler:
+    """Grants a limited number of request slots, to the interactive lane first.
+
+    While both lanes wait the batch lane still gets ``batch_share`` of the slots,
+    so a busy bot can't starve its background jobs forever."""
+    __slots__ = ("concurrency", "batch_share", "active", "_served", "_queues", "_credit")
+
+    def __init__(self, concurrency: int = 1, batch_share: float = 0.1):
+        if not 0 <= batch_share < 1:
+            raise ValueError("The batch share must be at least 0 and less than 1.")
+
+        self.concurrency = concurrency
+        self.batch_share = batch_share
+        self.active = 0
+
+        self._served = {INTERACTIVE: 0, BATCH: 0}
+        self._queues = {INTERACTIVE: deque(), BATCH: deque()}
+        self._credit = 0.0
+
+    def info(self) -> Dict[str, LaneInfo]:
+        return {lane: LaneInfo(len(queue), self._served[lane]) for lane, queue in self._queues.items()}
+
+    async def acquire(self, lane: str):
+        if self.try_acquire(lane):
+            return
+
+        queue = self._queues[lane]
+        waiter = asyncio.get_event_loop().create_future()
+        queue.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                if waiter in queue:
+                    queue.remove(waiter)
+            else:
+                # The slot was granted as the task got cancelled, pass it on.
+                self.release()
+            raise
+
+    def try_acquire(self, lane: str) -> bool:
+        # Only a free slot nobody waits for, extra requests mustn't delay queued ones.
+        if self.active < self.concurrency and not (self._queues[INTERACTIVE] or self._queues[BATCH]):
+            self.active += 1
+            self._served[lane] += 1
+            return True
+
+        return False
+
+    def release(self):
+        self.active -= 1
+        self._wake()
+
+    def resize(self, concurrency: int):
+        self.concurrency = concurrency
+        self._wake()
+
+    def _wake(self):
+        while self.active < self.concurrency:
+            lane = self._next_lane()
+            if lane is None:
+                return
+
+            self.active += 1
+            self._served[lane] += 1
+            self._queues[lane].popleft().set_result(None)
+
+    def _next_lane(self) -> Optional[str]:
+        interactive, batch = self._queues[INTERACTIVE], self._queues[BATCH]
+
+        # Waiters cancelled since the last wake up haven't removed themselves yet.
+        for queue in (interactive, batch):
+            while queue and queue[0].done():
+                queue.popleft()
+
+        if not batch:
+            self._credit = 0.0
+            return INTERACTIVE if interactive else None
+        if not interactive:
+            return BATCH
+
+        # Every interactive request served while batch ones wait earns them a fraction of a slot.
+        if self._credit >= 1:
+            self._credit -= 1
+            return BATCH
+
+        self._credit += self.batch_share / (1 - self.batch_share)
+        return INTERACTIVE
+
+
+class _Limiter:
+    """Adapts the number of requests in flight to what the API can take, with
+    additive increase and multiplicative decrease.
+
+    The limit grows by one every ``limit`` requests while their latency stays within ``tolerance``
+    times the lowest one recently seen, and shrinks by ``LATENCY_BACKOFF`` when it rises above it,
+    or by ``BACKOFF`` on 429s, 5xx errors and connection errors."""
+    __slots__ = ("minimum", "maximum", "tolerance", "limit", "_latency", "_floor", "_window_floor", "_samples",
+                 "_since_decrease")
+
+    ALPHA = 0.2
+    BACKOFF = 0.5
+    LATENCY_BACKOFF = 0.9
+    # The lowest latency is relearned every window, in case the API got slower for good.
+    FLOOR_WINDOW = 256
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64, tolerance: float = 2.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.limit = float(max(min(initial, maximum), minimum))
+
+        self._latency = None
+        self._floor = float("inf")
+        self._window_floor = float("inf")
+        self._samples = 0
+        self._since_decrease = float("inf")
+
+    def succeeded(self, elapsed: Optional[float], inflight: int):
+        self._since_decrease += 1
+
+        if elapsed is not None:
+            self._samples += 1
+            self._window_floor = min(self._window_floor, elapsed)
+            if self._samples % self.FLOOR_WINDOW == 0:
+                self._floor, self._window_floor = self._window_floor, float("inf")
+
+            if self._latency is None:
+                self._latency = elapsed
+            else:
+                self._latency = self._latency * (1 - self.ALPHA) + elapsed * self.ALPHA
+
+            if self._latency > min(self._floor, self._window_floor) * self.tolerance:
+                self._decrease(self.LATENCY_BACKOFF)
+                return
+
+        # Only grow when the limit is what holds requests back, not while the client is idle.
+        if inflight * 2 >= self.limit:
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+
+    def failed(self):
+        self._since_decrease += 1
+        self._decrease(self.BACKOFF)
+
+    def _decrease(self, factor: float):
+        # The requests in flight when the limit was lowered all saw the same overload, only count it once.
+        if self._since_decrease < self.limit:
+            return
+
+        self._since_decrease = 0
+        self.limit = max(self.limit * factor, self.minimum)
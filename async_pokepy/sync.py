@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .cache import CacheInfo, CacheRegistry
+from .client import Client
+from .scheduling import LaneInfo
+from .types import Ability, APIObject, Berry, Machine, Move, NamedAPIObject, Pokemon, PokemonColor, PokemonHabitat
+from .utils import maybe_coroutine
+
+__all__ = ("SyncClient",)
+
+
+class SyncClient:
+    """A blocking client for code that can't ``await``, e.g. threaded WSGI apps and scripts.
+
+    It runs a :class:`Client` on an event loop in a background thread, so calls from
+    any number of threads share the same caches, in-flight requests and connection pool.
+    The methods are the same as :class:`Client`'s, but they block until the result is ready.
+
+    .. versionadded:: 0.1.7a
+
+    .. code-block:: python3
+
+        with async_pokepy.SyncClient() as client:
+            pokemon = client.get_pokemon("Snorlax")
+
+    Parameters
+    ----------
+    base: Optional[:class:`str`]
+        The base to use for all API requests, defaults to ``https://pokeapi.co/api/v2/``.
+    timeout: Optional[:class:`float`]
+        How many seconds a call can take before raising :exc:`concurrent.futures.TimeoutError`,
+        defaults to ``None`` which means no limit.
+    \\*\\*kwargs
+        The other parameters of :func:`connect`, except ``loop``.
+
+    Attributes
+    ----------
+    loop: :class:`asyncio.AbstractEventLoop`
+        The event loop running in the background thread.
+    client: :class:`Client`
+        The asynchronous client, it must only be used from the background thread.
+    timeout: Optional[:class:`float`]
+        How many seconds a call can take."""
+    __slots__ = ("loop", "client", "timeout", "_thread")
+
+    def __init__(self, base: str = "https://pokeapi.co/api/v2/", *, timeout: Optional[float] = None, **kwargs):
+        if "loop" in kwargs:
+            raise TypeError("SyncClient runs its own event loop, loop cannot be passed.")
+
+        self.timeout = timeout
+        self.client = None
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async_pokepy", daemon=True)
+        self._thread.start()
+
+        try:
+            self.client = self._run(Client._connect, base, loop=self.loop, **kwargs)  # pylint: disable=protected-access
+        except BaseException:
+            self._stop()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _run(self, func, *args, **kwargs) -> Any:
+        if self.loop.is_closed():
+            raise RuntimeError("The client is closed.")
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("SyncClient cannot be used from its own event loop, use SyncClient.client instead.")
+
+        future = asyncio.run_coroutine_threadsafe(maybe_coroutine(func, *args, **kwargs), self.loop)
+
+        try:
+            return future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    @property
+    def caches(self) -> CacheRegistry:
+        """:class:`CacheRegistry`: The caches used by the client."""
+        return self.client.caches
+
+    @property
+    def concurrency_limit(self) -> int:
+        """:class:`int`: How many requests can currently be in flight at once, see :attr:`Client.concurrency_limit`."""
+        return self.client.concurrency_limit
+
+    def close(self):
+        """Close the connection to the API and stop the background thread.
+
+        Calling it again does nothing."""
+        if self.loop.is_closed():
+            return
+
+        try:
+            self._run(self.client.close)
+        finally:
+            self._stop()
+
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """See :meth:`Client.cache_info`."""
+        return self._run(self.client.cache_info)
+
+    def lane_info(self) -> Dict[str, LaneInfo]:
+        """See :meth:`Client.lane_info`."""
+        return self._run(self.client.lane_info)
+
+    def get_pokemon(self, query: Union[int, str], *, include: Iterable[str] = (), priority: str = None) -> Pokemon:
+        """See :meth:`Client.get_pokemon`."""
+        return self._run(self.client.get_pokemon, query, include=include, priority=priority)
+
+    def get_move(self, query: Union[int, str], *, include: Iterable[str] = (), priority: str = None) -> Move:
+        """See :meth:`Client.get_move`."""
+        return self._run(self.client.get_move, query, include=include, priority=priority)
+
+    def get_ability(self, query: Union[int, str], *, include: Iterable[str] = (), priority: str = None) -> Ability:
+        """See :meth:`Client.get_ability`."""
+        return self._run(self.client.get_ability, query, include=include, priority=priority)
+
+    def get_berry(self, query: Union[int, str], *, priority: str = None) -> Berry:
+        """See :meth:`Client.get_berry`."""
+        return self._run(self.client.get_berry, query, priority=priority)
+
+    def get_pokemon_color(self, query: Union[int, str], *, priority: str = None) -> PokemonColor:
+        """See :meth:`Client.get_pokemon_color`."""
+        return self._run(self.client.get_pokemon_color, query, priority=priority)
+
+    def get_pokemon_habitat(self, query: Union[int, str], *, priority: str = None) -> PokemonHabitat:
+        """See :meth:`Client.get_pokemon_habitat`."""
+        return self._run(self.client.get_pokemon_habitat, query, priority=priority)
+
+    def get_machine(self, query: Union[int, str], *, priority: str = None) -> Machine:
+        """See :meth:`Client.get_machine`."""
+        return self._run(self.client.get_machine, query, priority=priority)
+
+    def get_pagination(self, obj: str, **kwargs) -> List[Union[NamedAPIObject, APIObject]]:
+        """See :meth:`Client.get_pagination`, but every object is returned in a :class:`list`."""
+        return self._run(lambda: self.client.get_pagination(obj, **kwargs).flatten())
+
+    def save_sprite(self, url: str, fp, *, seek_begin: bool = True) -> int:
+        """See :meth:`Client.save_sprite`."""
+        return self._run(self.client.save_sprite, url, fp, seek_begin=seek_begin)
+
+    def read_sprite(self, url: str) -> bytes:
+        """See :meth:`Client.read_sprite`."""
+        return self._run(self.client.read_sprite, url)
+
+    def resolve(self, ref: APIObject) -> Any:
+        """See :meth:`Client.resolve`."""
+        return self._run(self.client.resolve, ref)
+
+    def resolve_all(self, refs: Iterable[APIObject]) -> List[Any]:
+        """See :meth:`Client.resolve_all`."""
+        return self._run(self.client.resolve_all, refs)
+
+    def build_index(self, *endpoints: str):
+        """See :meth:`Client.build_index`."""
+        return self._run(self.client.build_index, *endpoints)
+
+    def get_learners(self, move: Union[int, str]) -> List[NamedAPIObject]:
+        """See :meth:`Client.get_learners`."""
+        return self._run(self.client.get_learners, move)
+
+    def get_ability_holders(self, ability: Union[int, str]) -> List[NamedAPIObject]:
+        """See :meth:`Client.get_ability_holders`."""
+        return self._run(self.client.get_ability_holders, ability)
+
+    def get_item_holders(self, item: Union[int, str]) -> List[NamedAPIObject]:
+        """See :meth:`Client.get_item_holders`."""
+        return self._run(self.client.get_item_holders, item)
+
+    def get_move_machines(self, move: Union[int, str]) -> List[APIObject]:
+        """See :meth:`Client.get_move_machines`."""
+        return self._run(self.client.get_move_machines, move)
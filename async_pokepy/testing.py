@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+from collections import Counter
+from http import HTTPStatus
+from typing import Iterable, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import aiohttp
+from aiohttp import web
+from multidict import CIMultiDict
+
+from .transport import Response, Transport
+from .utils import _fmt_param
+
+__all__ = ("StubServer", "FixtureTransport", "record")
+
+_NOT_FOUND = (404, "text/plain", b"Not Found")
+
+
+def _load_fixtures(directory: str) -> dict:
+    endpoints = {}
+
+    for endpoint in os.listdir(directory):
+        path = os.path.join(directory, endpoint)
+        if not os.path.isdir(path):
+            continue
+
+        objects = endpoints[endpoint] = {}
+
+        for file in os.listdir(path):
+            if not file.endswith(".json"):
+                continue
+
+            with open(os.path.join(path, file), "rb") as f:
+                raw = f.read()
+
+            if file == "index.json":
+                objects[None] = json.loads(raw.decode("utf-8"))
+                continue
+
+            body = json.loads(raw.decode("utf-8"))
+
+            objects[str(body["id"])] = raw
+            if "name" in body:
+                objects[body["name"]] = raw
+
+    return endpoints
+
+
+class StubServer:
+    """A local stand-in for the PokeAPI, serving recorded JSON fixtures.
+
+    Fixtures are laid out as ``<directory>/<endpoint>/<id>.json``, e.g. ``pokemon/1.json``,
+    and can be looked up by both id and name, pagination is served from
+    ``<directory>/<endpoint>/index.json`` if present. See :func:`record` to create them.
+
+    All of the fault injection options are attributes that can be changed while the server runs.
+
+    .. versionadded:: 0.1.7a
+
+    .. code-block:: python3
+
+        async with StubServer("tests/fixtures", latency=0.05, error_rate=0.1) as server:
+            async with async_pokepy.connect(server.base) as client:
+                await client.get_pokemon(1)
+
+    Parameters
+    ----------
+    directory: :class:`str`
+        The fixtures directory.
+    host: Optional[:class:`str`]
+        The host to bind to, defaults to ``127.0.0.1``.
+    port: Optional[:class:`int`]
+        The port to bind to, defaults to ``0`` which picks a free one.
+    latency: Union[:class:`float`, Tuple[:class:`float`, :class:`float`]]
+        Seconds to wait before responding, or a range to pick a random delay from.
+    error_rate: :class:`float`
+        The probability of responding with a 500 or 502 status code.
+    rate_limit_rate: :class:`float`
+        The probability of responding with a 429 status code.
+    slow_body: :class:`float`
+        Seconds over which the body of successful responses is streamed, in small chunks.
+    synthesize: :class:`bool`
+        Whether to serve objects listed in an endpoint's ``index.json`` but without
+        a fixture, by copying another fixture of the endpoint with the id and name replaced.
+        Useful for load tests with realistic payloads from few fixtures.
+    sprite_size: :class:`int`
+        The size of the fake sprites served under ``/sprites/``, defaults to ``4096`` bytes.
+    seed: Optional[:class:`int`]
+        The seed of the random number generator used for faults.
+
+    Attributes
+    ----------
+    base: :class:`str`
+        The base url to pass to :func:`connect`, only available while the server is running.
+    sprite_base: :class:`str`
+        The base url of the fake sprites, only available while the server is running.
+    requests: :class:`collections.Counter`
+        The number of requests received, by endpoint."""
+
+    def __init__(self, directory: str, *, host: str = "127.0.0.1", port: int = 0,
+                 latency: Union[float, Tuple[float, float]] = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, slow_body: float = 0.0, synthesize: bool = False,
+                 sprite_size: int = 4096, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.slow_body = slow_body
+        self.synthesize = synthesize
+        self.sprite_size = sprite_size
+
+        self.base = None
+        self.sprite_base = None
+        self.requests = Counter()
+
+        self._random = random.Random(seed)
+        self._endpoints = _load_fixtures(directory)
+        self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def start(self):
+        """Start serving."""
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self._handle)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+
+        host, port = sock.getsockname()[:2]
+        self.base = "http://{0}:{1}/api/v2/".format(host, port)
+        self.sprite_base = "http://{0}:{1}/sprites/".format(host, port)
+
+    async def close(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request):
+        status, content_type, body = await self._route(request.rel_url.raw_path, request.query)
+
+        if status != 200 or not self.slow_body:
+            return web.Response(status=status, body=body, content_type=content_type)
+
+        resp = web.StreamResponse(headers={"Content-Type": content_type + "; charset=utf-8"})
+        resp.content_length = len(body)
+        await resp.prepare(request)
+
+        chunks = range(0, len(body), 1024)
+        for start in chunks:
+            await resp.write(body[start:start + 1024])
+            await asyncio.sleep(self.slow_body / len(chunks))
+
+        await resp.write_eof()
+        return resp
+
+    async def _route(self, path: str, params: Mapping[str, str]) -> Tuple[int, str, bytes]:
+        # Shared by the HTTP server and FixtureTransport, path is still percent-encoded.
+        if path.startswith("/sprites/"):
+            return self._get_sprite()
+
+        parts = path[len("/api/v2/"):].strip("/").split("/") if path.startswith("/api/v2/") else ()
+
+        if len(parts) == 1 and parts[0]:
+            return await self._get_pagination(unquote(parts[0]), params)
+        if len(parts) == 2:
+            return await self._get_object(unquote(parts[0]), unquote(parts[1]))
+
+        return _NOT_FOUND
+
+    async def _fault(self, endpoint: str) -> Optional[Tuple[int, str, bytes]]:
+        self.requests[endpoint] += 1
+
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+        if latency:
+            await asyncio.sleep(latency)
+
+        if self.rate_limit_rate and self._random.random() < self.rate_limit_rate:
+            return 429, "text/plain", b"Too Many Requests"
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._random.choice((500, 502)), "text/plain", b"Internal Server Error"
+
+        return None
+
+    async def _get_object(self, endpoint: str, query: str) -> Tuple[int, str, bytes]:
+        fault = await self._fault(endpoint)
+        if fault is not None:
+            return fault
+
+        query = _fmt_param(query)
+
+        try:
+            body = self._endpoints[endpoint][query]
+        except KeyError:
+            body = self._synthesize(endpoint, query) if self.synthesize else None
+
+        if body is None:
+            return _NOT_FOUND
+
+        return 200, "application/json", body
+
+    def _synthesize(self, endpoint: str, query: str) -> Optional[bytes]:
+        objects = self._endpoints.get(endpoint, {})
+        index = objects.get(None)
+        template = next((body for key, body in objects.items() if key is not None), None)
+
+        if index is None or template is None:
+            return None
+
+        for result in index["results"]:
+            id_ = result["url"].rstrip("/").split("/")[-1]
+
+            if query in (id_, result.get("name")):
+                body = json.loads(template.decode("utf-8"))
+                suffix = "/{0}.png".format(body["id"])
+
+                for key, value in body.get("sprites", {}).items():
+                    if isinstance(value, str):
+                        body["sprites"][key] = value.replace(suffix, "/{0}.png".format(id_))
+
+                body["id"] = int(id_)
+                if "name" in result:
+                    body["name"] = result["name"]
+
+                raw = objects[id_] = json.dumps(body).encode("utf-8")
+                if "name" in result:
+                    objects[result["name"]] = raw
+
+                return raw
+
+        return None
+
+    def _get_sprite(self) -> Tuple[int, str, bytes]:
+        self.requests["sprites"] += 1
+
+        # A PNG signature followed by filler, it only needs to look like a sprite.
+        return 200, "image/png", b"\x89PNG\r\n\x1a\n" + b"\x00" * max(self.sprite_size - 8, 0)
+
+    async def _get_pagination(self, endpoint: str, params: Mapping[str, str]) -> Tuple[int, str, bytes]:
+        fault = await self._fault(endpoint)
+        if fault is not None:
+            return fault
+
+        try:
+            index = self._endpoints[endpoint][None]
+        except KeyError:
+            return _NOT_FOUND
+
+        limit = int(params.get("limit", 20))
+        offset = int(params.get("offset", 0))
+
+        body = dict(index, results=index["results"][offset:offset + limit])
+        return 200, "application/json", json.dumps(body).encode("utf-8")
+
+
+class FixtureTransport(Transport):
+    """A :class:`~async_pokepy.Transport` serving requests from a :class:`StubServer` in the same process,
+    without sockets or HTTP parsing, e.g. to measure the CPU cost of the client alone.
+
+    The server doesn't need to be started, and its fault injection options still apply,
+    except ``slow_body`` which only delays the whole response.
+
+    .. versionadded:: 0.1.7a
+
+    .. code-block:: python3
+
+        transport = FixtureTransport(StubServer("tests/fixtures"))
+
+        async with async_pokepy.connect(transport.base, transport=transport) as client:
+            await client.get_pokemon(1)
+
+    Parameters
+    ----------
+    server: :class:`StubServer`
+        The server to serve the requests from.
+
+    Attributes
+    ----------
+    base: :class:`str`
+        The base url to pass to :func:`connect`.
+    sprite_base: :class:`str`
+        The base url of the fake sprites."""
+    __slots__ = ("server", "base", "sprite_base")
+
+    def __init__(self, server: StubServer):
+        self.server = server
+
+        self.base = "http://fixtures/api/v2/"
+        self.sprite_base = "http://fixtures/sprites/"
+
+    async def get(self, url: str, **kwargs) -> Response:
+        parts = urlsplit(url)
+        status, content_type, body = await self.server._route(  # pylint: disable=protected-access
+            parts.path, dict(parse_qsl(parts.query)))
+
+        if status == 200 and self.server.slow_body:
+            await asyncio.sleep(self.server.slow_body)
+
+        return Response("GET", url, status, HTTPStatus(status).phrase, CIMultiDict({"Content-Type": content_type}),
+                        body)
+
+
+async def record(queries: Iterable[Tuple[str, Union[int, str]]], directory: str, *,
+                 base: str = "https://pokeapi.co/api/v2/", indexes: Iterable[str] = ()):
+    """Record API responses as fixtures for :class:`StubServer`.
+
+    Requests are made one at a time to be gentle with the API.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    queries: Iterable[Tuple[:class:`str`, Union[:class:`int`, :class:`str`]]]
+        Pairs of endpoint and query to record, e.g. ``[("pokemon", 1), ("move", "pound")]``.
+    directory: :class:`str`
+        The fixtures directory, created if it doesn't exist.
+    base: Optional[:class:`str`]
+        The base url of the API to record from.
+    indexes: Iterable[:class:`str`]
+        Endpoints whose full pagination should be recorded, e.g. ``["pokemon"]``."""
+    async with aiohttp.ClientSession() as session:
+        async def fetch(url):
+            async with session.get(url) as resp:
+                resp.raise_for_status()
+                return await resp.read()
+
+        for endpoint, query in queries:
+            raw = await fetch("{0}{1}/{2}/".format(base, endpoint, _fmt_param(query)))
+            body = json.loads(raw.decode("utf-8"))
+
+            os.makedirs(os.path.join(directory, endpoint), exist_ok=True)
+            with open(os.path.join(directory, endpoint, "{0}.json".format(body["id"])), "wb") as f:
+                f.write(raw)
+
+        for endpoint in indexes:
+            count = json.loads((await fetch("{0}{1}/?limit=1".format(base, endpoint))).decode("utf-8"))["count"]
+            raw = await fetch("{0}{1}/?limit={2}".format(base, endpoint, count))
+
+            os.makedirs(os.path.join(directory, endpoint), exist_ok=True)
+            with open(os.path.join(directory, endpoint, "index.json"), "wb") as f:
+                f.write(raw)
+
+
+def _parse_query(thing: str) -> Tuple[str, str]:
+    endpoint, _, query = thing.partition(":")
+    if not query:
+        raise argparse.ArgumentTypeError("Expected endpoint:query, e.g. pokemon:1")
+
+    return endpoint, query
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m async_pokepy.testing")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    serve = commands.add_parser("serve", help="serve fixtures with a stub server")
+    serve.add_argument("directory")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--rate-limit-rate", type=float, default=0.0)
+    serve.add_argument("--slow-body", type=float, default=0.0)
+    serve.add_argument("--synthesize", action="store_true")
+    serve.add_argument("--seed", type=int)
+
+    rec = commands.add_parser("record", help="record API responses as fixtures")
+    rec.add_argument("directory")
+    rec.add_argument("queries", nargs="*", type=_parse_query, metavar="endpoint:query")
+    rec.add_argument("--base", default="https://pokeapi.co/api/v2/")
+    rec.add_argument("--index", action="append", default=[], help="also record the full pagination of an endpoint")
+
+    args = parser.parse_args(argv)
+    loop = asyncio.get_event_loop()
+
+    if args.command == "record":
+        loop.run_until_complete(record(args.queries, args.directory, base=args.base, indexes=args.index))
+        return
+
+    server = StubServer(args.directory, host=args.host, port=args.port, latency=args.latency,
+                        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                        slow_body=args.slow_body, synthesize=args.synthesize, seed=args.seed)
+    loop.run_until_complete(server.start())
+    print("Serving {0} on {1}".format(args.directory, server.base))
+
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.close())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+__all__ = ("Tracer",)
+
+
+class Tracer:
+    """The base class for request lifecycle hooks, passed to :func:`connect` with ``tracers``.
+
+    Subclass it and override the methods you need, all of them do nothing by default.
+    The methods are called synchronously on the event loop so they **must not** block,
+    e.g. they should only update counters or histograms.
+
+    Durations are in seconds, measured with :func:`time.perf_counter`.
+
+    For lower level events, like DNS resolution or connection reuse, pass
+    :class:`aiohttp.TraceConfig` objects to :func:`connect` with ``trace_configs``.
+
+    .. versionadded:: 0.1.7a"""
+    __slots__ = ()
+
+    def on_request_start(self, route, attempt: int):
+        """Called before every HTTP request to the API, including retries.
+
+        Parameters
+        ----------
+        route
+            The route requested, its ``endpoint`` attribute is
+            the first part of the path, e.g. ``pokemon``, and ``url`` the full url.
+        attempt: :class:`int`
+            The attempt number, starting from ``0``."""
+
+    def on_request_end(self, route, status: int, elapsed: float, nbytes: int):
+        """Called when a response, successful or not, was fully received and decoded.
+
+        Parameters
+        ----------
+        route
+            The route requested.
+        status: :class:`int`
+            The HTTP status code.
+        elapsed: :class:`float`
+            The time between :meth:`on_request_start` and now.
+        nbytes: :class:`int`
+            The size of the response body."""
+
+    def on_request_error(self, route, error: Exception, elapsed: float):
+        """Called instead of :meth:`on_request_end` when a request failed without a response,
+        e.g. on connection errors and timeouts.
+
+        Parameters
+        ----------
+        route
+            The route requested.
+        error: :exc:`Exception`
+            The error raised by the transport.
+        elapsed: :class:`float`
+            The time between :meth:`on_request_start` and now."""
+
+    def on_request_retry(self, route, status: int, attempt: int, delay: float):
+        """Called when a request failed and will be retried.
+
+        Parameters
+        ----------
+        route
+            The route requested.
+        status: :class:`int`
+            The HTTP status code of the failed attempt.
+        attempt: :class:`int`
+            The attempt number that failed.
+        delay: :class:`float`
+            How long the client will wait before retrying."""
+
+    def on_request_hedged(self, route, delay: float):
+        """Called when a request was slower than usual and an identical one was sent,
+        see the ``hedge`` parameter of :func:`connect`.
+
+        Parameters
+        ----------
+        route
+            The route requested.
+        delay: :class:`float`
+            How long the client waited for the first request before hedging it."""
+
+    def on_concurrency_limit(self, limit: int):
+        """Called when the adaptive concurrency limit changed,
+        see the ``adaptive_concurrency`` parameter of :func:`connect`.
+
+        Parameters
+        ----------
+        limit: :class:`int`
+            How many requests can now be in flight at once."""
+
+    def on_rate_limited(self, route):
+        """Called when the API responded with 429 TOO MANY REQUESTS.
+
+        Parameters
+        ----------
+        route
+            The route requested."""
+
+    def on_decode(self, route, elapsed: float):
+        """Called after the response body was decoded.
+
+        Parameters
+        ----------
+        route
+            The route requested.
+        elapsed: :class:`float`
+            The time spent decoding."""
+
+    def on_model_build(self, model: type, elapsed: float):
+        """Called after a full object, e.g. a :class:`Pokemon`, was built from the decoded data.
+
+        Parameters
+        ----------
+        model: :class:`type`
+            The class of the object.
+        elapsed: :class:`float`
+            The time spent building it."""
+
+    def on_cache_event(self, cache: str, event: str, amount: int):
+        """Called on every cache event, see :meth:`CacheRegistry.add_listener`.
+
+        Parameters
+        ----------
+        cache: :class:`str`
+            The name of the cache, e.g. ``get_pokemon``.
+        event: :class:`str`
+            The event, one of ``hit``, ``miss``, ``eviction`` and ``coalesced``.
+        amount: :class:`int`
+            By how much the counter of the event increased."""
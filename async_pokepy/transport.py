@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+"""
+The MIT License (MIT)
+
+Copyright (c) 2019 Lorenzo
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+import abc
+from typing import Mapping, Optional
+
+import aiohttp
+
+from .exceptions import PokemonException
+
+__all__ = (
+    "Response",
+    "Transport",
+    "AiohttpTransport",
+    "HTTPXTransport",
+)
+
+
+class Response:
+    """A fully read HTTP response, returned by a :class:`Transport`.
+
+    .. versionadded:: 0.1.7a
+
+    Attributes
+    ----------
+    method: :class:`str`
+        The HTTP method, e.g. ``GET``.
+    url: :class:`str`
+        The requested url.
+    status: :class:`int`
+        The HTTP status code.
+    reason: :class:`str`
+        The HTTP reason phrase, e.g. ``Not Found``.
+    headers: Mapping[:class:`str`, :class:`str`]
+        The response headers, with case insensitive keys.
+    body: :class:`bytes`
+        The response body.
+    encoding: :class:`str`
+        The encoding of the body."""
+    __slots__ = ("method", "url", "status", "reason", "headers", "body", "encoding")
+
+    def __init__(self, method: str, url: str, status: int, reason: str, headers: Mapping[str, str], body: bytes,
+                 encoding: str = "utf-8"):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.encoding = encoding
+
+    def __repr__(self) -> str:
+        return "<Response status={0.status} url='{0.url}'>".format(self)
+
+
+class Transport(metaclass=abc.ABCMeta):
+    """The abstract base class of the HTTP layer of a :class:`Client`, passed to :func:`connect` with ``transport``.
+
+    The default is :class:`AiohttpTransport`, :class:`HTTPXTransport` can multiplex requests
+    over HTTP/2 and :class:`async_pokepy.testing.FixtureTransport` serves fixtures without sockets.
+
+    .. versionadded:: 0.1.7a"""
+    __slots__ = ()
+
+    @abc.abstractmethod
+    async def get(self, url: str, **kwargs) -> Response:
+        """Make a GET request and read the whole response.
+
+        This method **must** be implemented by a subclass.
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The url to request.
+        \\*\\*kwargs
+            Extra options, specific to the transport.
+
+        Returns
+        -------
+        :class:`Response`
+            The response, whatever its status code."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Release the resources of the transport, e.g. its connections.
+
+        Does nothing by default."""
+
+
+class AiohttpTransport(Transport):
+    """The default :class:`Transport`, using an :class:`aiohttp.ClientSession`.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    headers: Optional[Mapping[:class:`str`, :class:`str`]]
+        The headers sent with every request, ignored if ``session`` is passed.
+    session: Optional[:class:`aiohttp.ClientSession`]
+        The session to use, by default one is created by the first request.
+    trace_configs: Optional[List[:class:`aiohttp.TraceConfig`]]
+        The trace configs of the created session.
+
+    Attributes
+    ----------
+    headers: Mapping[:class:`str`, :class:`str`]
+        The headers sent with every request."""
+    __slots__ = ("headers", "trace_configs", "_session")
+
+    def __init__(self, headers: Optional[Mapping[str, str]] = None, *,
+                 session: Optional[aiohttp.ClientSession] = None, trace_configs: Optional[list] = None):
+        self.headers = headers or {}
+        self.trace_configs = trace_configs
+
+        self._session = session if session is not None and not session.closed else None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """:class:`aiohttp.ClientSession`: The session, created the first time it's used."""
+        # Not created by connect, so clients that never make a request don't pay for it.
+        if self._session is None:
+            self._session = aiohttp.ClientSession(headers=self.headers, trace_configs=self.trace_configs)
+
+        return self._session
+
+    async def get(self, url: str, **kwargs) -> Response:
+        async with self.session.get(url, **kwargs) as resp:
+            body = await resp.read()
+
+            return Response(resp.method, url, resp.status, resp.reason, resp.headers, body, resp.get_encoding())
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+class HTTPXTransport(Transport):
+    """A :class:`Transport` using `httpx <https://www.python-httpx.org>`_, which can multiplex
+    concurrent requests over a single HTTP/2 connection, e.g. to a self-hosted mirror.
+
+    It requires ``httpx`` with HTTP/2 support, to install it run ``pip install async_pokepy[http2]``.
+
+    .. versionadded:: 0.1.7a
+
+    Parameters
+    ----------
+    headers: Optional[Mapping[:class:`str`, :class:`str`]]
+        The headers sent with every request, ignored if ``client`` is passed.
+    http2: :class:`bool`
+        Whether to use HTTP/2 when the server supports it, defaults to ``True``.
+    client: Optional[:class:`httpx.AsyncClient`]
+        The client to use instead of creating one.
+
+    Raises
+    ------
+    PokemonException
+        httpx is not installed."""
+    __slots__ = ("client",)
+
+    def __init__(self, headers: Optional[Mapping[str, str]] = None, *, http2: bool = True, client=None):
+        try:
+            import httpx  # Optional, and slow to import.
+        except ImportError:
+            raise PokemonException("HTTPXTransport requires httpx, install it with "
+                                   "pip install async_pokepy[http2].") from None
+
+        self.client = client if client is not None else httpx.AsyncClient(headers=headers, http2=http2)
+
+    async def get(self, url: str, **kwargs) -> Response:
+        resp = await self.client.get(url, **kwargs)
+
+        return Response("GET", url, resp.status_code, resp.reason_phrase, resp.headers, resp.content,
+                        resp.encoding or "utf-8")
+
+    async def close(self):
+        await self.client.aclose()
@@ -24,11 +24,30 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
-from .abc import *  # noqa: F401
-from .ability import *  # noqa: F401
-from .berry import *  # noqa: F401
-from .common import *  # noqa: F401
-from .machine import *  # noqa: F401
-from .move import *  # noqa: F401
-from .pagination import *  # noqa: F401
-from .pokemon import *  # noqa: F401
+import sys
+
+from ..utils import _lazy_exports
+
+_EXPORTS = {
+    ".abc": ("BaseObject", "AsyncIterator", "UnNamedBaseObject"),
+    ".ability": ("Ability", "AbilityEffectChange", "AbilityPokemon", "AbilityFlavorText"),
+    ".berry": ("Berry", "BerryFlavorMap"),
+    ".common": ("Name", "Effect", "VerboseEffect", "VersionGameIndex", "APIObject", "NamedAPIObject",
+                "MachineVersionDetail"),
+    ".machine": ("Machine",),
+    ".move": ("Move", "MoveFlavorText", "MoveMetaData", "MoveStatChange", "PastMoveStatValues", "ContestComboDetail",
+              "ContestComboSet"),
+    ".pagination": ("AsyncPaginationIterator",),
+    ".pokemon": ("Pokemon", "PokemonStat", "PokemonAbility", "PokemonType", "PokemonSprites", "PokemonMove",
+                 "PokemonMoveVersion", "Learnset", "PokemonHeldItem", "PokemonHeldItemVersion", "PokemonColor",
+                 "PokemonHabitat"),
+}
+
+__all__ = tuple(name for names in _EXPORTS.values() for name in names)
+
+# The modules are only imported when one of their names is used.
+__getattr__, __dir__ = _lazy_exports(__name__, globals(), _EXPORTS)
+
+if sys.version_info < (3, 7):  # Module __getattr__ isn't supported, import everything now.
+    for _name in __all__:
+        __getattr__(_name)
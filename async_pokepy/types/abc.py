@@ -25,6 +25,7 @@ DEALINGS IN THE SOFTWARE.
 """
 
 import abc
+import threading
 from difflib import SequenceMatcher
 from typing import Any, Callable, Optional
 
@@ -37,6 +38,8 @@ __all__ = (
     "UnNamedBaseObject"
 )
 
+_BUILD_LOCK = threading.RLock()
+
 
 class UnNamedBaseObject(metaclass=abc.ABCMeta):
     """The abstract base class which all other full objects without name inherit from.
@@ -60,17 +63,42 @@ class UnNamedBaseObject(metaclass=abc.ABCMeta):
 
             Check if two objects are *not* the same.
 
+    Full objects can be pickled, only their raw data is, and unpickled objects
+    are built the first time an attribute other than ``id`` or ``name`` is used.
+
+    .. versionchanged:: 0.1.7a
+
+        Pickling now only stores the raw data.
+
     Attributes
     ----------
     id: :class:`int`
         The object's unique identifier."""
-    __slots__ = ("id", "_data")
+    __slots__ = ("id", "_data", "_lazy")
 
     def __init__(self, data: dict):
         self._data = data
 
         self.id = data["id"]
 
+    def __reduce__(self):
+        return _rebuild, (self.__class__, self._data)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that aren't set, i.e. those of an unpickled object
+        # that wasn't built yet, and those that don't exist.
+        if name not in ("_data", "_lazy") and getattr(self, "_lazy", False):
+            # Objects shared across threads are built by one of them while the others wait,
+            # _lazy is only cleared once the object is complete.
+            with _BUILD_LOCK:
+                if getattr(self, "_lazy", False):
+                    self.__init__(self._data)
+                    del self._lazy
+
+            return getattr(self, name)
+
+        raise AttributeError("'{0.__class__.__name__}' object has no attribute '{1}'".format(self, name))
+
     def __getitem__(self, item) -> Any:
         return self._data[item]
 
@@ -146,6 +174,18 @@ class BaseObject(UnNamedBaseObject, metaclass=abc.ABCMeta):
         return "<{0.__class__.__name__} id={0.id} name='{0}'>".format(self)
 
 
+def _rebuild(cls, data: dict) -> UnNamedBaseObject:
+    obj = cls.__new__(cls)
+    obj._data = data  # pylint: disable=protected-access
+    obj._lazy = True  # pylint: disable=protected-access
+
+    obj.id = data["id"]
+    if isinstance(obj, BaseObject):
+        obj.name = _pretty_format(data["name"])
+
+    return obj
+
+
 class AsyncIterator(metaclass=abc.ABCMeta):
     """Represents an abstrast asynchronous iterator.
 
@@ -27,6 +27,8 @@ DEALINGS IN THE SOFTWARE.
 from .abc import BaseObject
 from .common import NamedAPIObject
 
+__all__ = ("Berry", "BerryFlavorMap")
+
 
 class Berry(BaseObject):
     """Represents a berry object from the API.
@@ -24,6 +24,9 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+import sys
+from typing import Awaitable
+
 from ..utils import _pretty_format
 
 __all__ = (
@@ -45,13 +48,50 @@ class APIObject:
     Attributes
     ----------
     id: :class:`int`
-        The object's identifier."""
+        The object's identifier.
+    endpoint: :class:`str`
+        The API endpoint of the object, e.g. ``pokemon``.
+
+        .. versionadded:: 0.1.7a
+    resolved: Optional[:data:`~typing.Any`]
+        The full object, if it was fetched with the ``include`` parameter of a ``get_`` method.
+
+        .. versionadded:: 0.1.7a"""
+    resolved = None
+
     def __init__(self, data: dict):
-        self.id = int(data["url"].split("/")[-2])
+        parts = data["url"].split("/")
+
+        self.id = int(parts[-2])
+        self.endpoint = sys.intern(parts[-3])
 
     def __repr__(self) -> str:
         return "<APIObject id={0.id}>".format(self)
 
+    def resolve(self, client) -> Awaitable:
+        """Get the full object, e.g. the :class:`Ability` of an ability reference.
+
+        This is a shortcut for :meth:`Client.resolve`, so references resolved
+        concurrently are fetched in a single batch.
+
+        .. versionadded:: 0.1.7a
+
+        Parameters
+        ----------
+        client: :class:`Client`
+            The client used to get the object.
+
+        Raises
+        ------
+        PokemonException
+            There is no ``get_`` method for the object's endpoint.
+
+        Returns
+        -------
+        Awaitable
+            An awaitable with the full object."""
+        return client.resolve(self)
+
 
 class NamedAPIObject(APIObject):
     """Represents a partial API object with a name and ID.
@@ -197,8 +237,8 @@ class MachineVersionDetail:
     version_group: :class:`NamedAPIObject`
         The version group of this specific machine."""
     def __init__(self, data: dict):
-        self.machine = APIObject(data)
-        self.version_group = NamedAPIObject(data)
+        self.machine = APIObject(data["machine"])
+        self.version_group = NamedAPIObject(data["version_group"])
 
     def __repr__(self) -> str:
         return "<MachineVersionDetail version_group='{0.version_group}'>".format(self)
@@ -44,9 +44,9 @@ class AsyncPaginationIterator(AsyncIterator):
             Iterates over the contents of the async iterator.
 
     .. versionadded:: 0.1.0a"""
-    __slots__ = ("limit", "offset", "thing", "can_iter", "_http", "_queue")
+    __slots__ = ("limit", "offset", "thing", "can_iter", "priority", "_http", "_queue")
 
-    def __init__(self, http, thing: str, limit: int = 20, offset: int = 0):
+    def __init__(self, http, thing: str, limit: int = 20, offset: int = 0, priority: str = None):
         if limit < 1:
             raise ValueError("Limit cannot be 0 or negative.")
         if offset < 0:
@@ -55,6 +55,7 @@ class AsyncPaginationIterator(AsyncIterator):
         self.limit = limit
         self.offset = offset
         self.thing = thing
+        self.priority = priority
 
         self.can_iter = True
         self._http = http
@@ -88,7 +89,7 @@ class AsyncPaginationIterator(AsyncIterator):
 
     async def fill_queue(self):
         if self.can_iter:
-            data = await self._http.get_pagination(self.thing, limit=self.limit, offset=self.offset)
+            data = await self._http.get_pagination(self.thing, self.priority, limit=self.limit, offset=self.offset)
 
             if not data["results"]:
                 raise NoMoreItems()
@@ -24,8 +24,13 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+from bisect import bisect_right
+from operator import itemgetter
+from typing import List, Optional, Tuple
+
+from ..utils import _fmt_param
 from .abc import BaseObject
-from .common import NamedAPIObject, VersionGameIndex, Name
+from .common import Name, NamedAPIObject, VersionGameIndex
 
 __all__ = (
     "Pokemon",
@@ -35,6 +40,7 @@ __all__ = (
     "PokemonSprites",
     "PokemonMove",
     "PokemonMoveVersion",
+    "Learnset",
     "PokemonHeldItem",
     "PokemonHeldItemVersion",
     "PokemonColor",
@@ -98,7 +104,7 @@ class Pokemon(BaseObject):
     __slots__ = (
         "stats", "types", "weight", "moves", "abilities", "height",
         "sprites", "held_items", "base_experience", "is_default", "order",
-        "species", "forms", "game_indices"
+        "species", "forms", "game_indices", "_learnset"
     )
 
     def __init__(self, data: dict):
@@ -123,6 +129,20 @@ class Pokemon(BaseObject):
         self.held_items = [PokemonHeldItem(d) for d in data["held_items"]]
         self.game_indices = [VersionGameIndex(d) for d in data["game_indices"]]
 
+        self._learnset = None
+
+    @property
+    def learnset(self) -> "Learnset":
+        """:class:`Learnset`: The moves of the Pokémon indexed by version group and learn method.
+
+        It's built the first time it's used.
+
+        .. versionadded:: 0.1.7a"""
+        if self._learnset is None:
+            self._learnset = Learnset(self.moves)
+
+        return self._learnset
+
 
 class PokemonStat:
     """Represents a stat of a :class:`Pokemon`.
@@ -325,6 +345,141 @@ class PokemonMoveVersion:
                 .format(self))
 
 
+class Learnset:
+    """Represents the moves of a :class:`Pokemon` indexed by version group and learn method.
+
+    Version groups and learn methods can be passed with any spelling
+    of their name, e.g. ``red-blue`` or ``Red Blue``.
+
+    .. versionadded:: 0.1.7a
+
+    .. container:: operations
+
+        .. describe:: y in x
+
+            Check if the Pokémon can learn a move, by name, in any way."""
+    __slots__ = ("_levels", "_moves", "_learned", "_level_of")
+
+    def __init__(self, moves: List[PokemonMove]):
+        entries = {}
+        learned = {}
+        groups = {}
+
+        for move in moves:
+            key = _fmt_param(move.move.name)
+            learned[key] = move.move
+
+            for detail in move.version_group_details:
+                names = (detail.version_group.name, detail.move_learn_method.name)
+
+                try:
+                    group = groups[names]
+                except KeyError:
+                    group = groups[names] = tuple(_fmt_param(name) for name in names)
+                    entries[group] = []
+
+                entries[group].append((detail.level_learned_at, key, move.move))
+
+        self._levels = {}
+        self._moves = {}
+        self._learned = learned
+        self._level_of = {}
+
+        for group, learnset in entries.items():
+            learnset.sort(key=itemgetter(0, 1))
+
+            self._levels[group] = [level for level, _, _ in learnset]
+            self._moves[group] = [(level, move) for level, _, move in learnset]
+
+            version_group, method = group
+            if method == "level-up":
+                for level, key, _ in learnset:
+                    self._level_of.setdefault((version_group, key), level)
+
+    def __repr__(self) -> str:
+        return "<Learnset moves={0} version_groups={1}>".format(len(self._learned), len(self.version_groups))
+
+    def __contains__(self, move: str) -> bool:
+        return _fmt_param(move) in self._learned
+
+    @property
+    def version_groups(self) -> List[str]:
+        """List[:class:`str`]: The names of the version groups in which the Pokémon learns moves, sorted."""
+        return sorted({group for group, _ in self._moves})
+
+    def learn_methods(self, version_group: str) -> List[str]:
+        """Get the ways the Pokémon learns moves in a version group.
+
+        Parameters
+        ----------
+        version_group: :class:`str`
+            The name of the version group, e.g. ``red-blue``.
+
+        Returns
+        -------
+        List[:class:`str`]
+            The names of the learn methods, sorted."""
+        version_group = _fmt_param(version_group)
+        return sorted(method for group, method in self._moves if group == version_group)
+
+    def moves(self, version_group: str, learn_method: str = "level-up") -> List[Tuple[int, NamedAPIObject]]:
+        """Get the moves learned in a version group with a learn method.
+
+        Parameters
+        ----------
+        version_group: :class:`str`
+            The name of the version group, e.g. ``red-blue``.
+        learn_method: :class:`str`
+            The name of the learn method, e.g. ``machine``. Defaults to ``level-up``.
+
+        Returns
+        -------
+        List[Tuple[:class:`int`, :class:`NamedAPIObject`]]
+            The level the move is learned at, ``0`` if it doesn't depend on the level,
+            and the move, sorted by level and name."""
+        return list(self._moves.get((_fmt_param(version_group), _fmt_param(learn_method)), ()))
+
+    def moves_until(self, version_group: str, level: int,
+                    limit: Optional[int] = None) -> List[Tuple[int, NamedAPIObject]]:
+        """Get the moves learned by leveling up until a level in a version group.
+
+        Parameters
+        ----------
+        version_group: :class:`str`
+            The name of the version group, e.g. ``red-blue``.
+        level: :class:`int`
+            The level, included.
+        limit: Optional[:class:`int`]
+            How many of the most recently learned moves to return,
+            e.g. ``4`` for the moves of a wild Pokémon.
+
+        Returns
+        -------
+        List[Tuple[:class:`int`, :class:`NamedAPIObject`]]
+            The level the move is learned at and the move, sorted by level and name."""
+        group = (_fmt_param(version_group), "level-up")
+        end = bisect_right(self._levels.get(group, ()), level)
+        start = max(end - limit, 0) if limit is not None else 0
+
+        return self._moves[group][start:end] if end else []
+
+    def level_of(self, move: str, version_group: str) -> Optional[int]:
+        """Get the level a move is learned at by leveling up in a version group.
+
+        Parameters
+        ----------
+        move: :class:`str`
+            The name of the move.
+        version_group: :class:`str`
+            The name of the version group, e.g. ``red-blue``.
+
+        Returns
+        -------
+        Optional[:class:`int`]
+            The lowest level, ``None`` if the move is not learned by leveling up."""
+        return self._level_of.get((_fmt_param(version_group), _fmt_param(move)))
+
+
 class PokemonHeldItem:
     """Represents an item held by a :class:`Pokemon`.
 
@@ -25,19 +25,17 @@ DEALINGS IN THE SOFTWARE.
 """
 
 import functools
-import warnings
-from inspect import isawaitable
-from typing import Union
+import importlib
+import unicodedata
+from typing import Callable, Dict, Iterable, Tuple, Union
 from urllib.parse import quote
 
-try:
-    from lru import LRU
-except ImportError:
-    LRU = None
+from .exceptions import NotFound
 
 __all__ = ()
 
 
+@functools.lru_cache(maxsize=2048)
 def _fmt_param(thing: Union[int, str]) -> str:
     if isinstance(thing, int):
         return str(thing)
@@ -51,6 +49,14 @@ def _pretty_format(thing: str) -> str:
     return thing.replace("-", " ").title()
 
 
+@functools.lru_cache(maxsize=2048)
+def _alias_key(name: str) -> str:
+    # "Mr. Mime", "mr mime" and "MR-MIME" all become "mrmime", "Flabébé" becomes "flabebe".
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+
+    return "".join(char for char in name.lower() if char.isalnum())
+
+
 def _make_cache_key(key):
     if isinstance(key, str):
         if key.isdigit():
@@ -61,31 +67,54 @@ def _make_cache_key(key):
     return key
 
 
-def cached(maxsize: int, with_name: bool = True):
+def cached(with_name: bool = True):
+    from .scheduling import _check_lane  # Deferred, only the client needs asyncio.
+
     def outer(func):
-        @functools.wraps(func)
-        async def inner(cls, query: Union[int, str]):  # Very specific but it works and will work for most get_ methods
-            query = _make_cache_key(query)
+        name = func.__name__
+        endpoint = name[4:].replace("_", "-")  # get_pokemon_color -> pokemon-color
 
-            for key, value in cache.items():
-                if query in key:
-                    return value
+        @functools.wraps(func)  # Very specific but it works
+        async def inner(cls, query: Union[int, str], *, include: Iterable[str] = (), priority: str = None):
+            _check_lane(priority)
+            tree = cls._include_tree(name, include) if include else None  # pylint: disable=protected-access
 
-            val = await func(cls, query)
-            if with_name:
-                cache[(_make_cache_key(val.name), _make_cache_key(val.id))] = val
-            else:
-                cache[(_make_cache_key(val.id),)] = val
+            caches = cls._caches  # pylint: disable=protected-access
+            cache = caches[name]
+            query = caches.names.resolve(endpoint, _make_cache_key(query))
 
-            return val
+            if query is None:
+                raise NotFound(None, "No {0} found by this name or id.".format(endpoint))
+
+            async def load():
+                error = caches.not_found.get((name, query))
+                if error is not None:
+                    raise error.with_traceback(None)
+
+                try:
+                    val = await func(cls, query, priority)
+                except NotFound as exc:
+                    caches.not_found.put((name, query), exc)
+                    raise
+
+                size = getattr(val.to_dict(), "nbytes", 0)
+                cache.put(val.id, val, name=val.name if with_name else None, size=size)
+                caches.names.add(endpoint, val.name if with_name else None, val.id)
+                if caches.relations is not None:
+                    caches.relations.add(val)
+
+                caches.not_found.invalidate((name, val.id))
+                if with_name:
+                    caches.not_found.invalidate((name, _make_cache_key(val.name)))
+
+                return val
 
-        if LRU:
-            cache = LRU(maxsize)
-        else:
-            cache = {}
-            warnings.warn("lru-dict is not installed, so the cache will not have a maxsize.")
+            val = await cache.load(query, load)
 
-        inner.cache = cache
+            if tree:
+                val = await cls._include(val, tree)  # pylint: disable=protected-access
+
+            return val
 
         return inner
 
@@ -93,7 +122,29 @@ def cached(maxsize: int, with_name: bool = True):
 
 
 async def maybe_coroutine(f, *args, **kwargs):
+    from inspect import isawaitable  # Deferred, inspect takes longer to import than the whole package.
+
     value = f(*args, **kwargs)
     if isawaitable(value):
         return await value
     return value
+
+
+def _lazy_exports(package: str, namespace: dict, exports: Dict[str, Iterable[str]]) -> Tuple[Callable, Callable]:
+    # The module __getattr__ and __dir__ of a package, importing the submodule
+    # of a public name the first time it's used. ``exports`` maps submodules to their names.
+    modules = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name: str):
+        try:
+            module = modules[name]
+        except KeyError:
+            raise AttributeError("module '{0}' has no attribute '{1}'".format(package, name)) from None
+
+        value = namespace[name] = getattr(importlib.import_module(module, package), name)
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(namespace) | set(modules))
+
+    return __getattr__, __dir__
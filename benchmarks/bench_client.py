@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from async_pokepy import Ability, Move, NameIndex, Pokemon
+from async_pokepy.http import Route
+from async_pokepy.utils import _fmt_param, _make_cache_key
+from conftest import FIXTURES, load_fixture
+
+BASE = "https://pokeapi.co/api/v2/"
+
+
+def bench_route(benchmark):
+    benchmark(Route, BASE, "pokemon", "Mr Mime")
+
+
+def bench_route_pagination(benchmark):
+    benchmark(Route, BASE, "pokemon", limit=20, offset=40)
+
+
+@pytest.mark.parametrize("query", [1, "Bulbasaur", "Mr. Mime"], ids=["id", "name", "spaced-name"])
+def bench_fmt_param(benchmark, query):
+    benchmark(_fmt_param, query)
+
+
+@pytest.mark.parametrize("query", [1, "1", "Bulbasaur"], ids=["id", "digit-string", "name"])
+def bench_make_cache_key(benchmark, query):
+    benchmark(_make_cache_key, query)
+
+
+@pytest.mark.parametrize("query", ["mr-mime", "mr.-mime"], ids=["exact", "loose"])
+def bench_name_resolve(benchmark, query):
+    index = NameIndex()
+    index.update("pokemon", load_fixture("pokemon", "index")["results"], complete=True)
+
+    benchmark(index.resolve, "pokemon", query)
+
+
+def bench_json_decode(benchmark):
+    with open("{0}/pokemon/1.json".format(FIXTURES), encoding="utf-8") as f:
+        raw = f.read()
+
+    benchmark(json.loads, raw)
+
+
+@pytest.mark.parametrize("model,endpoint", [(Pokemon, "pokemon"), (Move, "move"), (Ability, "ability")],
+                         ids=["pokemon", "move", "ability"])
+def bench_model(benchmark, model, endpoint):
+    benchmark(model, load_fixture(endpoint))
+
+
+def bench_learnset(benchmark):
+    pokemon = Pokemon(load_fixture("pokemon"))
+
+    def query():
+        pokemon._learnset = None  # pylint: disable=protected-access
+        return pokemon.learnset.moves_until("red-blue", 30, limit=4)
+
+    benchmark(query)
+
+
+def bench_learnset_cached(benchmark):
+    pokemon = Pokemon(load_fixture("pokemon"))
+
+    benchmark(pokemon.learnset.moves_until, "red-blue", 30, limit=4)
+
+
+def bench_cache_hit(benchmark, loop, client):
+    loop.run_until_complete(client.get_pokemon(1))
+
+    benchmark(lambda: loop.run_until_complete(client.get_pokemon("bulbasaur")))
+
+
+def bench_cache_miss(benchmark, loop, client):
+    cache = client.caches["get_pokemon"]
+
+    def miss():
+        cache.clear()
+        return loop.run_until_complete(client.get_pokemon(1))
+
+    benchmark(miss)
+
+
+def bench_cache_miss_in_process(benchmark, loop, in_process_client):
+    bench_cache_miss(benchmark, loop, in_process_client)
+
+
+def bench_pagination(benchmark, loop, client):
+    benchmark(lambda: loop.run_until_complete(client.get_pagination("pokemon", limit=151).flatten()))
+
+
+def bench_pagination_in_process(benchmark, loop, in_process_client):
+    bench_pagination(benchmark, loop, in_process_client)
+
+
+def bench_find_similar(benchmark, loop, client):
+    benchmark(lambda: loop.run_until_complete(client.get_pagination("pokemon", limit=151).find_similar("charmandr")))
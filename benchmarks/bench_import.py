@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+STATEMENTS = {
+    "package": "import async_pokepy",
+    "model": "from async_pokepy import Pokemon",
+    "client": "from async_pokepy import connect",
+}
+
+
+def import_time(statement):
+    """The microseconds spent importing by ``statement``, reported by ``python -X importtime``."""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], stderr=subprocess.PIPE,
+                            check=True, universal_newlines=True).stderr
+
+    total = 0
+    started = False
+
+    # Lines are "import time: self | cumulative | name", nested imports are indented and come first.
+    for line in output.splitlines():
+        _, cumulative, name = line.split("|")
+        started = started or name.strip().startswith("async_pokepy")
+
+        if started and not name[1:].startswith(" ") and cumulative.strip().isdigit():
+            total += int(cumulative)
+
+    return total
+
+
+@pytest.mark.parametrize("statement", list(STATEMENTS), ids=list(STATEMENTS))
+def bench_import(benchmark, statement):
+    benchmark.extra_info["import_time_us"] = benchmark.pedantic(import_time, (STATEMENTS[statement],), rounds=5)
@@ -0,0 +1,83 @@
+import asyncio
+import gc
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import async_pokepy
+from async_pokepy.testing import StubServer
+from conftest import FIXTURES
+
+COUNT = 50
+EXECUTORS = {"inline": None, "thread-pool": ThreadPoolExecutor, "process-pool": ProcessPoolExecutor}
+
+
+@pytest.fixture(scope="module")
+def synthesized_server():
+    """A server running on its own event loop and thread, so that it doesn't count towards the client's lag."""
+    loop = asyncio.new_event_loop()
+    server = StubServer(FIXTURES, synthesize=True)
+    loop.run_until_complete(server.start())
+
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+async def lag_ticker(lags, interval=0.001):
+    """Records how late the event loop wakes it up, which is how long it was blocked."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+@pytest.mark.parametrize("collect", [True, False], ids=["gc", "no-gc"])
+@pytest.mark.parametrize("executor", list(EXECUTORS), ids=list(EXECUTORS))
+def bench_loop_lag(benchmark, loop, synthesized_server, executor, collect):
+    """Fetches, builds and reads COUNT Pokemon while measuring how long the event loop is blocked at a time.
+
+    The cyclic garbage collector pauses every thread, its pauses grow with the number of cached objects
+    and usually dominate the maximum lag, so the lag is measured both with and without it."""
+    executor = EXECUTORS[executor] and EXECUTORS[executor](1)
+    client = loop.run_until_complete(async_pokepy.connect(synthesized_server.base, loop=loop, executor=executor,
+                                                          offload_threshold=0 if executor else None))
+    lags = []
+
+    async def run():
+        client.caches.clear()
+        ticker = asyncio.ensure_future(lag_ticker(lags))
+
+        pokemon = await asyncio.gather(*(client.get_pokemon(i) for i in range(1, COUNT + 1)))
+        # Objects only cost their build once they're used, wherever that happens.
+        for obj in pokemon:
+            obj.moves  # pylint: disable=pointless-statement
+
+        ticker.cancel()
+
+    if not collect:
+        gc.disable()
+
+    try:
+        loop.run_until_complete(run())  # warm up the server and the executor
+        lags.clear()
+
+        benchmark.pedantic(lambda: loop.run_until_complete(run()), rounds=5)
+    finally:
+        gc.enable()
+        loop.run_until_complete(client.close())
+        if executor is not None:
+            executor.shutdown()
+
+    lags.sort()
+    benchmark.extra_info["median_lag"] = lags[len(lags) // 2]
+    benchmark.extra_info["max_lag"] = lags[-1]
+    benchmark.extra_info["p99_lag"] = lags[int(len(lags) * 0.99)]
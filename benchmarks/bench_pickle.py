@@ -0,0 +1,35 @@
+import pickle
+
+import pytest
+
+from async_pokepy import Ability, Machine, Move, Pokemon
+from conftest import load_fixture
+
+MODELS = [(Pokemon, "pokemon", "moves"), (Move, "move", "names"), (Ability, "ability", "pokemon"),
+          (Machine, "machine", "move")]
+IDS = [endpoint for _, endpoint, _ in MODELS]
+
+
+@pytest.mark.parametrize("model,endpoint,attribute", MODELS, ids=IDS)
+def bench_pickle_dumps(benchmark, model, endpoint, attribute):
+    obj = model(load_fixture(endpoint))
+
+    benchmark.extra_info["size"] = len(benchmark(pickle.dumps, obj, pickle.HIGHEST_PROTOCOL))
+
+
+@pytest.mark.parametrize("model,endpoint,attribute", MODELS, ids=IDS)
+def bench_pickle_loads(benchmark, model, endpoint, attribute):
+    raw = pickle.dumps(model(load_fixture(endpoint)), pickle.HIGHEST_PROTOCOL)
+
+    benchmark(pickle.loads, raw)
+
+
+@pytest.mark.parametrize("model,endpoint,attribute", MODELS, ids=IDS)
+def bench_pickle_round_trip(benchmark, model, endpoint, attribute):
+    """Pickling and unpickling followed by an attribute access, which builds the object."""
+    obj = model(load_fixture(endpoint))
+
+    def round_trip():
+        return getattr(pickle.loads(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)), attribute)
+
+    benchmark(round_trip)
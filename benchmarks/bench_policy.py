@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from async_pokepy import LRUBackend, ObjectCache, TinyLFUBackend
+from async_pokepy.loadtest import ZipfSampler
+
+POPULATION = 2000
+CACHE_SIZE = 100
+REQUESTS = 20000
+
+
+def zipf_trace(seed=0):
+    sampler = ZipfSampler(list(range(POPULATION)), 1.0, random.Random(seed))
+    return [sampler.sample() for _ in range(REQUESTS)]
+
+
+def scan_trace(seed=0):
+    """Zipf traffic interleaved with full scans of objects requested only once, like paginations."""
+    trace = zipf_trace(seed)
+    scan = iter(range(POPULATION, POPULATION * 10))
+
+    for index in range(0, len(trace), 1000):
+        trace[index:index] = [next(scan) for _ in range(500)]
+
+    return trace
+
+
+def sized_trace(seed=0):
+    """Zipf traffic where the popular objects are small and some unpopular ones are huge."""
+    rng = random.Random(seed)
+    sizes = [rng.choice((2000, 4000, 8000, 200000)) for _ in range(POPULATION)]
+
+    return [(key, sizes[key]) for key in zipf_trace(seed)]
+
+
+def replay(cache, trace):
+    for item in trace:
+        key, size = item if isinstance(item, tuple) else (item, 1)
+
+        if cache.get(key) is None:
+            cache.put(key, key, size=size)
+
+    return cache.hits / (cache.hits + cache.misses)
+
+
+TRACES = {"zipf": zipf_trace(), "zipf-scan": scan_trace()}
+
+
+@pytest.mark.parametrize("backend", [LRUBackend, TinyLFUBackend], ids=["lru", "tinylfu"])
+@pytest.mark.parametrize("trace", list(TRACES), ids=list(TRACES))
+def bench_hit_rate(benchmark, backend, trace):
+    def run():
+        cache = ObjectCache("get_pokemon", CACHE_SIZE, backend=backend)
+        return replay(cache, TRACES[trace])
+
+    benchmark.extra_info["hit_rate"] = benchmark.pedantic(run, rounds=3)
+
+
+@pytest.mark.parametrize("backend", [LRUBackend, TinyLFUBackend], ids=["lru", "tinylfu"])
+def bench_hit_rate_sized(benchmark, backend):
+    trace = sized_trace()
+
+    def run():
+        # LRUBackend can't bound bytes, give it as many objects as fit on average.
+        if backend is LRUBackend:
+            cache = ObjectCache("get_pokemon", CACHE_SIZE, backend=backend)
+        else:
+            cache = ObjectCache("get_pokemon", POPULATION, maxbytes=CACHE_SIZE * 53500)
+
+        return replay(cache, trace)
+
+    benchmark.extra_info["hit_rate"] = benchmark.pedantic(run, rounds=3)
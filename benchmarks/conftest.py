@@ -0,0 +1,55 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import async_pokepy
+from async_pokepy.testing import FixtureTransport, StubServer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "fixtures")
+
+
+def load_fixture(endpoint, name="1"):
+    with open(os.path.join(FIXTURES, endpoint, "{0}.json".format(name)), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    yield loop
+
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def server(loop):
+    server = StubServer(FIXTURES)
+    loop.run_until_complete(server.start())
+
+    yield server
+
+    loop.run_until_complete(server.close())
+
+
+@pytest.fixture
+def client(loop, server):
+    client = loop.run_until_complete(async_pokepy.connect(server.base, loop=loop))
+
+    yield client
+
+    loop.run_until_complete(client.close())
+
+
+@pytest.fixture
+def in_process_client(loop):
+    """A client served by FixtureTransport, so only its own CPU cost is measured."""
+    transport = FixtureTransport(StubServer(FIXTURES))
+    client = loop.run_until_complete(async_pokepy.connect(transport.base, loop=loop, transport=transport))
+
+    yield client
+
+    loop.run_until_complete(client.close())
@@ -21,10 +21,16 @@ EXTRA_REQS = {
     "lru": [
         "lru-dict"
     ],
+    "http2": [
+        "httpx[http2]"
+    ],
     "docs": [
         "sphinx==1.7.4",
         "sphinxcontrib-asyncio",
     ],
+    "benchmarks": [
+        "pytest-benchmark"
+    ],
     "tests": [
         "flake8",
         "pylint",
@@ -1,13 +1,52 @@
 import asyncio
+import contextlib
 import functools
+import gc
+import importlib
 import io
+import json
+import logging
+import os
+import pickle
+import subprocess
 import sys
+import threading
+import time
+import weakref
+from concurrent import futures
 
 import aiohttp
 import pytest
 
-from async_pokepy import Ability, Berry, Machine, Move, NamedAPIObject, NotFound, Pokemon, connect
-from async_pokepy.http import Route
+import async_pokepy
+from async_pokepy import (BATCH, INTERACTIVE, Ability, Berry, CacheRegistry, HTTPXTransport, LaneInfo, Machine, Move,
+                          NamedAPIObject, NotFound, ObjectCache, PokeAPIException, Pokemon, PokemonException,
+                          RateLimited, Response, SyncClient, TinyLFUBackend, Tracer, Transport, connect, priority)
+from async_pokepy.http import Route, _Offloader
+from async_pokepy.loadtest import run as run_loadtest
+from async_pokepy.scheduling import _Scheduler
+from async_pokepy.testing import FixtureTransport, StubServer
+from async_pokepy.utils import _make_cache_key
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@contextlib.contextmanager
+def threaded_server(**kwargs):
+    loop = asyncio.new_event_loop()
+    server = StubServer(FIXTURES, **kwargs)
+    loop.run_until_complete(server.start())
+
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
 
 
 def run_async(func):
@@ -23,22 +62,22 @@ def run_async(func):
 async def test_pokemon():
     client = await connect()
 
-    assert not client.get_pokemon.cache
+    assert not client.caches["get_pokemon"]
 
     with pytest.raises(NotFound):
         await client.get_pokemon("notapokemon")
         await client.get_pokemon(9999)
 
-    assert not client.get_pokemon.cache
+    assert not client.caches["get_pokemon"]
 
     poke = await client.get_pokemon(1)
 
     assert isinstance(poke, Pokemon)
-    assert client.get_pokemon.cache
+    assert client.caches["get_pokemon"]
 
-    assert not client._image_cache  # pylint: disable=protected-access
+    assert not client.caches.sprites
     isinstance(await client.read_sprite(poke.sprites.back_default), bytes)
-    assert client._image_cache  # pylint: disable=protected-access
+    assert client.caches.sprites
 
     ret = io.BytesIO()
     assert isinstance(await client.save_sprite(poke.sprites.back_default, ret), int)
@@ -50,18 +89,18 @@ async def test_pokemon():
 async def test_ability():
     client = await connect()
 
-    assert not client.get_ability.cache
+    assert not client.caches["get_ability"]
 
     with pytest.raises(NotFound):
         await client.get_ability("notanability")
         await client.get_ability(9999)
 
-    assert not client.get_ability.cache
+    assert not client.caches["get_ability"]
 
     ability = await client.get_ability(1)
 
     assert isinstance(ability, Ability)
-    assert client.get_ability.cache
+    assert client.caches["get_ability"]
 
     await client.close()
 
@@ -70,18 +109,18 @@ async def test_ability():
 async def test_move():
     client = await connect()
 
-    assert not client.get_move.cache
+    assert not client.caches["get_move"]
 
     with pytest.raises(NotFound):
         await client.get_move("notamove")
         await client.get_move(99999)
 
-    assert not client.get_move.cache
+    assert not client.caches["get_move"]
 
     move = await client.get_move(1)
 
     assert isinstance(move, Move)
-    assert client.get_move.cache
+    assert client.caches["get_move"]
 
     await client.close()
 
@@ -90,18 +129,18 @@ async def test_move():
 async def test_berry():
     client = await connect()
 
-    assert not client.get_berry.cache
+    assert not client.caches["get_berry"]
 
     with pytest.raises(NotFound):
         await client.get_berry("getberry")
         await client.get_berry(99999)
 
-    assert not client.get_berry.cache
+    assert not client.caches["get_berry"]
 
     berry = await client.get_berry(1)
 
     assert isinstance(berry, Berry)
-    assert client.get_berry.cache
+    assert client.caches["get_berry"]
 
     await client.close()
 
@@ -125,16 +164,16 @@ async def test_pagination():
 async def test_machine():
     client = await connect()
 
-    assert not client.get_machine.cache
+    assert not client.caches["get_machine"]
 
     with pytest.raises(NotFound):
         await client.get_machine("notamachine")
 
-    assert not client.get_machine.cache
+    assert not client.caches["get_machine"]
 
     assert isinstance(await client.get_machine(1), Machine)
 
-    assert client.get_machine.cache
+    assert client.caches["get_machine"]
 
     await client.close()
 
@@ -154,8 +193,761 @@ async def test_other():
     async with connect(session=session) as client:
         pokemon = await client.get_pokemon("snorlax")
 
-        assert client._http._session is session  # pylint: disable=protected-access
+        assert client._http.transport.session is session  # pylint: disable=protected-access
 
     for _ in pokemon.sprites:
         pass
-    assert client._http._session.closed  # pylint: disable=protected-access
+    assert session.closed
+
+
+def test_cache():
+    cache = ObjectCache("get_pokemon", 2)
+
+    cache.put(1, "bulbasaur", name="Bulbasaur")
+    cache.put(2, "ivysaur", name="Ivysaur")
+
+    assert cache.get(1) == cache.get("1") == cache.get("bulbasaur") == "bulbasaur"
+
+    cache.put(3, "venusaur", name="Venusaur")
+
+    assert len(cache) == 2
+    assert cache.get("ivysaur") is None
+    assert "venusaur" in cache
+
+    cache.invalidate("Venusaur")
+    assert cache.get(3) is None
+
+    registry = CacheRegistry({"get_move": 10})
+    assert registry["get_move"].maxsize == 10
+    assert registry["get_pokemon"].maxsize == 128
+    assert registry["get_move"] is registry["get_move"]
+
+    expired = ObjectCache("get_move", ttl=0)
+    expired.put(1, "pound", name="Pound")
+    assert expired.get("pound") is None
+
+
+def test_tinylfu():
+    backend = TinyLFUBackend(100)
+
+    for _ in range(5):
+        for key in range(50):
+            backend[key] = key
+            assert backend[key] == key
+
+    # A scan of keys requested only once should not flush the popular ones.
+    for key in range(1000, 2000):
+        backend[key] = key
+
+    assert len(backend) == 100
+    assert sum(key in backend for key in range(50)) >= 45
+
+    sized = ObjectCache("get_pokemon", maxbytes=100)
+
+    for key in range(10):
+        sized.put(key, str(key), size=30)
+
+    assert sized.nbytes <= 100
+    assert len(sized) == 3
+
+
+def test_cache_budget():
+    registry = CacheRegistry(budget=1000)
+    pokemon = registry["get_pokemon"]
+
+    for key in range(10):
+        pokemon.put(key, str(key), size=100)
+
+    for _ in range(20):
+        assert pokemon.get(9) is not None
+
+    for key in range(10):
+        registry.sprites.put(str(key), bytes(100))
+
+    assert registry.nbytes <= 1000
+    assert pokemon.nbytes > registry.sprites.nbytes
+    assert pokemon.evictions + registry.sprites.evictions == 10
+
+    pokemon.clear()
+    registry.sprites.clear()
+    registry.sprites.nbytes = 2000  # Drifted, with nothing left to evict.
+    registry["get_move"].put(1, "pound")
+
+    class Value:
+        pass
+
+    # Objects evicted for the budget are freed, whichever backend is the default.
+    registry = CacheRegistry(budget=300)
+    values = [Value() for _ in range(10)]
+    refs = [weakref.ref(value) for value in values]
+    for key, value in enumerate(values):
+        registry["get_pokemon"].put(key, value, size=100)
+
+    del values, value
+    gc.collect()
+    assert sum(ref() is not None for ref in refs) == len(registry["get_pokemon"]) == 3
+
+
+@run_async
+async def test_cache_info():
+    cache = ObjectCache("get_pokemon")
+    calls = []
+
+    async def loader():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        cache.put(1, "bulbasaur", name="Bulbasaur", size=10)
+
+        return "bulbasaur"
+
+    assert await asyncio.gather(cache.load(1, loader), cache.load("1", loader)) == ["bulbasaur", "bulbasaur"]
+    assert await cache.load("bulbasaur", loader) == "bulbasaur"
+    assert len(calls) == 1
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.coalesced, info.currsize, info.nbytes) == (1, 2, 1, 1, 10)
+
+    events = []
+    registry = CacheRegistry(1)
+    registry.add_listener(lambda *args: events.append(args))
+
+    registry["get_move"].put(1, "pound")
+    registry["get_move"].put(2, "karate-chop")
+    registry.sprites.get("https://example.com/1.png")
+
+    assert events == [("get_move", "eviction", 1), ("sprites", "miss", 1)]
+    assert registry.info()["get_move"].evictions == 1
+
+
+@run_async
+async def test_cancelled_load():
+    cache = ObjectCache("get_pokemon")
+
+    async def loader():
+        await asyncio.sleep(0.05)
+        cache.put(1, "bulbasaur", size=10)
+
+        return "bulbasaur"
+
+    first = asyncio.ensure_future(cache.load(1, loader))
+    second = asyncio.ensure_future(cache.load(1, loader))
+    await asyncio.sleep(0.01)
+
+    # The waiting caller takes over the load instead of being cancelled too.
+    first.cancel()
+    assert await second == "bulbasaur"
+    assert first.cancelled()
+    assert cache.get(1) == "bulbasaur"
+
+
+@run_async
+async def test_client_caches():
+    async with StubServer(FIXTURES) as server, connect(server.base) as client, connect(server.base) as other:
+        await client.get_pokemon(1)
+
+        assert client.caches["get_pokemon"]
+        assert not other.caches["get_pokemon"]
+
+    shared = CacheRegistry()
+    async with connect(cache=shared) as client, connect(cache=shared) as other:
+        assert client.caches is other.caches is shared
+
+
+@run_async
+async def test_logging(caplog):
+    caplog.set_level(logging.DEBUG, logger="async_pokepy.http")
+    transport = FixtureTransport(StubServer(FIXTURES))
+
+    async with connect(transport.base, transport=transport, log_payload_limit=50, log_summaries=True) as client:
+        await client.get_pokemon(1)
+
+    summary, = [record.pokeapi_request for record in caplog.records if hasattr(record, "pokeapi_request")]
+    assert (summary["endpoint"], summary["status"], summary["attempt"]) == ("pokemon", 200, 0)
+
+    payload, = [record.getMessage() for record in caplog.records if "succeeded with data" in record.msg]
+    text, suffix = payload.split(" succeeded with data ", 1)[1].rsplit("... ", 1)
+    assert len(text) == 50 and suffix == "({0} bytes)".format(summary["nbytes"])
+
+    caplog.clear()
+    async with connect(transport.base, transport=transport, log_payload_limit=0) as client:
+        await client.get_pokemon(1)
+
+    assert caplog.records and not any("succeeded with data" in record.msg for record in caplog.records)
+
+
+@run_async
+async def test_tracing():
+    events = []
+
+    class RecordingTracer(Tracer):
+        def on_request_end(self, route, status, elapsed, nbytes):
+            events.append((route.endpoint, status))
+
+        def on_model_build(self, model, elapsed):
+            events.append((model, elapsed >= 0))
+
+        def on_request_error(self, route, error, elapsed):
+            events.append((route.endpoint, type(error)))
+
+        def on_cache_event(self, cache, event, amount):
+            events.append((cache, event))
+
+    class FailingTransport(FixtureTransport):
+        async def get(self, url, **kwargs):
+            if "berry" in url:
+                raise aiohttp.ClientConnectionError(url)
+            return await super().get(url, **kwargs)
+
+    transport = FailingTransport(StubServer(FIXTURES))
+
+    async with connect(transport.base, transport=transport, tracers=[RecordingTracer()]) as client:
+        await client.get_move(1)
+        await client.get_move(1)
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.get_berry(1)
+
+    assert events == [("get_move", "miss"), ("not_found", "miss"), ("move", 200), (Move, True), ("get_move", "hit"),
+                      ("get_berry", "miss"), ("not_found", "miss"), ("berry", aiohttp.ClientConnectionError)]
+
+
+@run_async
+async def test_stub():
+    async with StubServer(FIXTURES, seed=0) as server, connect(server.base) as client:
+        assert isinstance(await client.get_pokemon("bulbasaur"), Pokemon)
+        assert len(await client.get_pagination("pokemon", limit=151).flatten()) == 151
+
+        for _ in range(3):
+            with pytest.raises(NotFound):
+                await client.get_move("Not A Move")
+
+        assert client.caches.not_found.hits == 2
+        assert "not-a-move" not in client.caches["get_move"]
+
+        server.rate_limit_rate = 1
+        with pytest.raises(RateLimited):
+            await client.get_ability(1)
+
+        server.rate_limit_rate = 0
+        server.slow_body = 0.05
+        assert isinstance(await client.get_ability(1), Ability)
+
+        assert server.requests == {"pokemon": 2, "move": 1, "ability": 2}
+
+
+@run_async
+async def test_fixture_transport():
+    transport = FixtureTransport(StubServer(FIXTURES, synthesize=True))
+
+    async with connect(transport.base, transport=transport) as client:
+        assert (await client.get_pokemon("Mr Mime")).id == 122
+        assert len(await client.get_pagination("pokemon", limit=151).flatten()) == 151
+        assert (await client.read_sprite(transport.sprite_base + "1.png")).startswith(b"\x89PNG")
+
+        with pytest.raises(NotFound) as exc:
+            await client.get_move("Not A Move")
+        assert exc.value.response.status == 404 and exc.value.response.reason == "Not Found"
+
+        assert transport.server.requests == {"pokemon": 2, "move": 1, "sprites": 1}
+
+
+@run_async
+async def test_httpx_transport():
+    pytest.importorskip("httpx")
+
+    async with StubServer(FIXTURES) as server:
+        async with connect(server.base, transport=HTTPXTransport(http2=False)) as client:
+            assert (await client.get_pokemon(1)).id == 1
+
+            with pytest.raises(NotFound):
+                await client.get_pokemon(999)
+
+        assert server.requests == {"pokemon": 2}
+
+
+@run_async
+async def test_hedging():
+    class SlowTransport(FixtureTransport):
+        delays = iter([0.005] * 40 + [1, 0])
+
+        async def get(self, url, **kwargs):
+            await asyncio.sleep(next(self.delays, 0))
+            return await super().get(url, **kwargs)
+
+    transport = SlowTransport(StubServer(FIXTURES))
+    hedged = []
+
+    class HedgeTracer(Tracer):
+        def on_request_hedged(self, route, delay):
+            hedged.append((route.endpoint, delay))
+
+    async with connect(transport.base, transport=transport, hedge=True, max_concurrency=2,
+                       tracers=[HedgeTracer()]) as client:
+        for _ in range(40):
+            client.caches.clear()
+            await client.get_pokemon(1)
+
+        client.caches.clear()
+        await asyncio.wait_for(client.get_pokemon(1), 0.5)
+
+        assert [endpoint for endpoint, _ in hedged] == ["pokemon"]
+        assert client._http.hedger.won == 1  # pylint: disable=protected-access
+        assert client._http.scheduler.active == 0  # pylint: disable=protected-access
+        assert transport.server.requests == {"pokemon": 41}  # The slow one was cancelled before it got there.
+
+    # Hedges need a free slot, the only one is taken by the request itself.
+    transport.delays = iter([0.005] * 40 + [0.05])
+    async with connect(transport.base, transport=transport, hedge=True) as client:
+        for _ in range(41):
+            client.caches.clear()
+            await client.get_pokemon(1)
+
+        assert client._http.hedger.hedged == 0  # pylint: disable=protected-access
+
+
+@run_async
+async def test_mirrors():
+    class MirrorTransport(FixtureTransport):
+        down = {"http://b/"}
+        limited = set()
+        hits = {"http://a/": 0, "http://b/": 0}
+
+        async def get(self, url, **kwargs):
+            mirror = url[:len("http://a/")]
+            self.hits[mirror] += 1
+
+            if mirror in self.down:
+                raise aiohttp.ClientConnectionError(mirror)
+            if mirror in self.limited:
+                return Response("GET", url, 429, "Too Many Requests", {}, b"")
+            return await super().get(url, **kwargs)
+
+    transport = MirrorTransport(StubServer(FIXTURES))
+    bases = ["http://a/api/v2/", "http://b/api/v2/"]
+
+    assert Route(bases[0], "pokemon", 1).url_for(bases[1]) == "http://b/api/v2/pokemon/1"
+
+    async with connect(bases=bases, transport=transport, health_check_interval=0) as client:
+        for _ in range(20):
+            client.caches.clear()
+            assert (await client.get_pokemon(1)).id == 1
+
+        # The dead mirror was left out after three failures, all failed over to the other one.
+        assert transport.hits == {"http://a/": 20, "http://b/": 3}
+        assert transport.server.requests == {"pokemon": 20}
+
+        transport.down.clear()
+        for mirror in client._http.balancer.mirrors:  # pylint: disable=protected-access
+            mirror.down_until = 0
+
+        for _ in range(20):
+            client.caches.clear()
+            await client.get_pokemon(1)
+
+        assert transport.hits["http://b/"] > 3
+
+        # A rate limited mirror fails over too, the request only fails once every mirror is.
+        transport.limited.add("http://a/")
+        client.caches.clear()
+        assert (await client.get_pokemon(1)).id == 1
+
+        transport.limited.add("http://b/")
+        client.caches.clear()
+        with pytest.raises(RateLimited):
+            await client.get_pokemon(1)
+        transport.limited.clear()
+
+    transport.down.add("http://b/")
+    async with connect(bases=bases, transport=transport, hedge=True, max_concurrency=2) as client:
+        http = client._http  # pylint: disable=protected-access
+        health_task = http._health_task  # pylint: disable=protected-access
+        http.balancer.mirrors[1].down_until = time.monotonic() + 60
+        http.hedger._delays["pokemon"] = 0.0  # pylint: disable=protected-access
+        http.hedger._tokens = http.hedger.MAX_TOKENS  # pylint: disable=protected-access
+
+        hits = dict(transport.hits)
+        await client.get_pokemon(1)
+
+        # The only other mirror is down, so the request isn't hedged to it.
+        assert http.hedger.hedged == 0
+        assert transport.hits == {"http://a/": hits["http://a/"] + 1, "http://b/": hits["http://b/"]}
+
+    assert health_task.done()
+
+
+@run_async
+async def test_scheduler_cancel():
+    scheduler = _Scheduler(1)
+    await scheduler.acquire(INTERACTIVE)
+
+    cancelled = asyncio.ensure_future(scheduler.acquire(INTERACTIVE))
+    waiting = asyncio.ensure_future(scheduler.acquire(BATCH))
+    await asyncio.sleep(0)
+
+    # The slot is released before the cancelled waiter gets to remove itself.
+    cancelled.cancel()
+    scheduler.release()
+
+    await asyncio.wait_for(waiting, 1)
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert scheduler.active == 1
+    assert scheduler.info() == {INTERACTIVE: LaneInfo(0, 1), BATCH: LaneInfo(0, 1)}
+
+
+@run_async
+async def test_priority_lanes():
+    class OrderedTransport(FixtureTransport):
+        order = []
+
+        async def get(self, url, **kwargs):
+            self.order.append(int(url.rsplit("/", 1)[1]))
+            await asyncio.sleep(0.001)
+            return await super().get(url, **kwargs)
+
+    transport = OrderedTransport(StubServer(FIXTURES, synthesize=True, seed=0))
+
+    async with connect(transport.base, transport=transport, batch_share=0.2) as client:
+        with priority(BATCH):
+            crawl = [asyncio.ensure_future(client.get_pokemon(i)) for i in range(1, 21)]
+        await asyncio.sleep(0)
+
+        lookups = [asyncio.ensure_future(client.get_pokemon(i, priority=INTERACTIVE)) for i in range(21, 29)]
+        await asyncio.sleep(0)
+
+        assert client.lane_info() == {INTERACTIVE: LaneInfo(8, 0), BATCH: LaneInfo(19, 1)}
+
+        await asyncio.gather(*crawl, *lookups)
+
+        # Interactive requests go first, but one in five goes to the waiting batch requests.
+        assert transport.order == [1, 21, 22, 23, 24, 2, 25, 26, 27, 28] + list(range(3, 21))
+        assert client.lane_info() == {INTERACTIVE: LaneInfo(0, 8), BATCH: LaneInfo(0, 20)}
+
+        with pytest.raises(ValueError):
+            await client.get_pokemon(1, priority="urgent")
+
+    with pytest.raises(ValueError):
+        with priority("urgent"):
+            pass
+
+
+@run_async
+async def test_adaptive_concurrency():
+    class CapacityTransport(Transport):
+        inflight = peak = 0
+        status = 200
+
+        async def get(self, url, **kwargs):
+            self.inflight += 1
+            self.peak = max(self.peak, self.inflight)
+            try:
+                # Up to 8 requests are served in parallel, more queue up upstream.
+                await asyncio.sleep(0.005 * max(1, self.inflight / 8))
+            finally:
+                self.inflight -= 1
+
+            # Tiny bodies, so the latency measured isn't the event loop decoding the others.
+            return Response("GET", url, self.status, "", {"Content-Type": "application/json"}, b"{}")
+
+    transport = CapacityTransport()
+    limits = []
+
+    class LimitTracer(Tracer):
+        def on_concurrency_limit(self, limit):
+            limits.append(limit)
+
+    async with connect("http://capacity/", transport=transport, adaptive_concurrency=True,
+                       tracers=[LimitTracer()]) as client:
+        assert client.concurrency_limit == 4
+
+        async def worker(offset):
+            for query in range(20):
+                await client._http.get_pokemon((offset + query) % 151 + 1)  # pylint: disable=protected-access
+
+        await asyncio.gather(*[worker(offset * 20) for offset in range(32)])
+
+        assert 4 < client.concurrency_limit <= 24
+        assert transport.peak <= 24
+        assert limits[-1] == client.concurrency_limit
+
+        transport.status = 503
+        for _ in range(40):
+            with pytest.raises(PokeAPIException):
+                await client._http.get_pokemon(1)  # pylint: disable=protected-access
+
+        assert client.concurrency_limit == 1
+
+
+@run_async
+async def test_name_index():
+    async with StubServer(FIXTURES, synthesize=True, seed=0) as server, connect(server.base) as client:
+        await client.build_index("pokemon")
+
+        mime = await client.get_pokemon("Mr. Mime")
+        assert mime.id == 122
+        assert await client.get_pokemon("mr mime") is await client.get_pokemon("MR-MIME") is mime
+
+        # Accents are folded like the rest of the spelling, the index being complete doesn't reject them.
+        client.caches.names.add("pokemon", "flabebe", 669)
+        assert client.caches.names.resolve("pokemon", _make_cache_key("Flabébé")) == 669
+
+        with pytest.raises(NotFound):
+            await client.get_pokemon("missingno")
+        with pytest.raises(NotFound):
+            await client.get_pokemon(999)
+
+        assert server.requests == {"pokemon": 3}
+
+
+@run_async
+async def test_relations():
+    async with StubServer(FIXTURES, synthesize=True, seed=0) as server, \
+            connect(server.base, index_relations=True) as client:
+        await client.get_pokemon(1)
+        await client.get_pokemon("ivysaur")
+
+        assert [pokemon.name for pokemon in await client.get_learners("Razor Wind")] == ["Bulbasaur", "Ivysaur"]
+        assert (await client.get_ability_holders(1))[0].name == "Grimer"
+        assert await client.get_item_holders("unknown-item") == []
+
+        machine = await client.get_machine(1)
+        assert [m.id for m in client.caches.relations.machines(machine.move.id)] == [1]
+
+        assert server.requests == {"pokemon": 2, "ability": 1, "machine": 1}
+
+        async with connect(server.base) as other:
+            with pytest.raises(PokemonException):
+                await other.get_learners(1)
+
+
+@run_async
+async def test_resolve():
+    async with StubServer(FIXTURES, synthesize=True, seed=0) as server, connect(server.base) as client:
+        await client.get_pokemon(1)
+
+        refs = [NamedAPIObject({"name": str(i), "url": "{0}pokemon/{1}/".format(server.base, i)}) for i in (2, 3, 2, 1)]
+        pokemon = await client.resolve_all(refs)
+
+        assert [p.id for p in pokemon] == [2, 3, 2, 1]
+        assert await refs[0].resolve(client) is pokemon[0]
+        assert server.requests == {"pokemon": 3}
+        assert client.loader.merged == 1
+
+        with pytest.raises(PokemonException):
+            await client.resolve(NamedAPIObject({"name": "grass", "url": "{0}type/12/".format(server.base)}))
+
+        ability = await client.get_ability(1, include=["pokemon"])
+        assert [p.pokemon.resolved.id for p in ability.pokemon] == [88, 89, 109, 110]
+        assert server.requests == {"pokemon": 7, "ability": 1}
+
+        # The cached object doesn't keep the objects included alive.
+        cached = await client.get_ability(1)
+        assert cached == ability and cached is not ability
+        assert all(p.pokemon.resolved is None for p in cached.pokemon)
+
+        with pytest.raises(ValueError):
+            await client.get_ability(2, include=["species"])
+        with pytest.raises(ValueError):
+            await client.get_ability(2, include=["pokemon.abilities.pokemon.moves"])
+        with pytest.raises(TypeError):
+            await client.get_ability(2, include="pokemon")
+
+        assert server.requests == {"pokemon": 7, "ability": 1}
+
+
+def test_learnset():
+    with open(os.path.join(FIXTURES, "pokemon", "1.json"), encoding="utf-8") as f:
+        pokemon = Pokemon(json.load(f))
+
+    learnset = pokemon.learnset
+    assert pokemon.learnset is learnset
+    assert "Sleep Powder" in learnset
+
+    moves = learnset.moves("Red Blue")
+    assert [level for level, _ in moves] == sorted(level for level, _ in moves)
+    assert learnset.moves_until("red-blue", 15, limit=4) == [move for move in moves if move[0] <= 15][-4:]
+    assert learnset.level_of("sleep-powder", "red-blue") == 2
+    assert "level-up" in learnset.learn_methods("red-blue")
+
+
+def test_pickle():
+    with open(os.path.join(FIXTURES, "pokemon", "1.json"), encoding="utf-8") as f:
+        pokemon = Pokemon(json.load(f))
+
+    raw = pickle.dumps(pokemon)
+    assert len(raw) < len(pickle.dumps(pokemon._data)) * 1.1  # pylint: disable=protected-access
+
+    unpickled = pickle.loads(raw)
+    assert unpickled == pokemon and str(unpickled) == "Bulbasaur"
+    assert not hasattr(unpickled, "missing")
+
+    assert [m.move.name for m in unpickled.moves] == [m.move.name for m in pokemon.moves]
+    assert unpickled.learnset.level_of("sleep-powder", "red-blue") == 2
+    assert unpickled["base_experience"] == pokemon.base_experience
+
+    # Threads reading an object that isn't built yet wait for the one building it.
+    for _ in range(20):
+        unpickled = pickle.loads(raw)
+        barrier = threading.Barrier(4)
+        moves = []
+
+        def read(obj=unpickled, barrier=barrier, moves=moves):
+            barrier.wait()
+            moves.append(len(obj.moves))
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert moves == [len(pokemon.moves)] * 4
+
+
+@run_async
+async def test_offload():
+    loop = asyncio.get_event_loop()
+
+    with futures.ThreadPoolExecutor(1) as executor:
+        offloader = _Offloader(executor, budget=1)
+        assert not offloader.offloads(1000)
+        assert await offloader.run(loop, 1000, sum, [1, 2]) == 3
+
+        assert offloader.offloads(10 ** 15) and not offloader.offloads(1000)
+        assert await offloader.run(loop, 10 ** 15, sum, [1, 2]) == 3
+
+        async with StubServer(FIXTURES) as server, \
+                connect(server.base, executor=executor, offload_threshold=0) as client:
+            assert client._http.builder.offloads(0)  # pylint: disable=protected-access
+
+            pokemon = await client.get_pokemon(1)
+            assert isinstance(pokemon, Pokemon) and pokemon.name == "Bulbasaur"
+            assert len(await client.get_pagination("pokemon", limit=151).flatten()) == 151
+
+    with futures.ProcessPoolExecutor(1) as executor:
+        async with StubServer(FIXTURES) as server, \
+                connect(server.base, executor=executor, offload_threshold=0) as client:
+            # Objects built in another process would come back unbuilt, only decoding is offloaded.
+            assert client._http.decoder.offloads(0)  # pylint: disable=protected-access
+            assert not client._http.builder.offloads(0)  # pylint: disable=protected-access
+
+            pokemon = await client.get_pokemon(1)
+            assert not getattr(pokemon, "_lazy", False) and pokemon.moves
+
+
+def test_sync_client():
+    with threaded_server(latency=0.05) as server, SyncClient(server.base) as client:
+        with futures.ThreadPoolExecutor(8) as executor:
+            pokemon = list(executor.map(client.get_pokemon, [1] * 12))
+
+        assert all(p is pokemon[0] for p in pokemon)
+        assert client.get_pokemon("Bulbasaur") is pokemon[0]
+        assert server.requests == {"pokemon": 1}
+
+        assert len(client.get_pagination("pokemon", limit=151)) == 151
+        with pytest.raises(NotFound):
+            client.get_move("Not A Move")
+
+        client.timeout = 0.01
+        with pytest.raises(futures.TimeoutError):
+            client.get_ability(1)
+
+    assert client.loop.is_closed()
+    with pytest.raises(RuntimeError):
+        client.get_pokemon(1)
+    client.close()
+
+
+def test_shared_registry():
+    registry = CacheRegistry()
+
+    async def lookup(base):
+        async with connect(base, cache=registry) as client:
+            return await asyncio.gather(client.get_pokemon(1), client.get_pokemon(1))
+
+    def run_on_new_loop(base):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(lookup(base))
+        finally:
+            loop.close()
+
+    with threaded_server(latency=0.1) as server, futures.ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(run_on_new_loop, [server.base] * 4))
+
+        assert all(pokemon is results[0][0] for result in results for pokemon in result)
+        assert server.requests == {"pokemon": 1}
+        assert registry["get_pokemon"].coalesced == 7
+
+    # Cancelling the first caller on one loop doesn't cancel the callers waiting on the others.
+    registry = CacheRegistry()
+    started = threading.Event()
+
+    async def cancelled(base):
+        async with connect(base, cache=registry) as client:
+            task = asyncio.ensure_future(client.get_pokemon(1))
+            await asyncio.sleep(0.01)
+            started.set()
+
+            while not registry["get_pokemon"].coalesced:
+                await asyncio.sleep(0.01)
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    async def waiting(base):
+        started.wait()
+        async with connect(base, cache=registry) as client:
+            return await client.get_pokemon(1)
+
+    def run(coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    with threaded_server(latency=0.1) as server, futures.ThreadPoolExecutor(2) as executor:
+        first = executor.submit(run, cancelled(server.base))
+        second = executor.submit(run, waiting(server.base))
+
+        first.result(5)
+        assert second.result(5).id == 1
+        assert registry["get_pokemon"].get(1) is second.result()
+
+    # An object stored by another thread after the lookup, but before the lock was taken, isn't loaded again.
+    class StaleCache(ObjectCache):
+        def get(self, key):
+            return None
+
+    async def loader():
+        raise AssertionError("loaded again")
+
+    cache = StaleCache("get_pokemon")
+    cache.put(1, "bulbasaur")
+    assert run(cache.load(1, loader)) == "bulbasaur"
+
+
+def test_lazy_imports():
+    code = ("import sys, async_pokepy; assert 'aiohttp' not in sys.modules; async_pokepy.Pokemon;"
+            "assert 'aiohttp' not in sys.modules and 'async_pokepy.types.move' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    for module, names in async_pokepy._EXPORTS.items():  # pylint: disable=protected-access
+        assert set(importlib.import_module(module, "async_pokepy").__all__) <= set(names)
+    assert set(dir(async_pokepy)) >= set(async_pokepy.__all__)
+
+    with pytest.raises(AttributeError):
+        async_pokepy.Missing  # pylint: disable=pointless-statement
+
+
+@run_async
+async def test_loadtest():
+    report = await run_loadtest(fixtures=FIXTURES, mix={"get_pokemon": 1, "sprite": 1}, duration=0.5,
+                                concurrency=4, seed=0, cache_size=16)
+
+    assert report["operations"]["get_pokemon"]["count"]
+    assert report["caches"]["get_pokemon"]["maxsize"] == 16
+    assert not report["errors"]